@@ -4,6 +4,7 @@ from .project_manager import (
     get_available_projects,
     load_project_mapping_async,
     save_project_json_async,
+    show_pending_messages,
     backup_file
 )
 
@@ -11,5 +12,6 @@ __all__ = [
     'get_available_projects',
     'load_project_mapping_async',
     'save_project_json_async',
+    'show_pending_messages',
     'backup_file'
 ]
@@ -646,86 +646,118 @@ class BlinkManager:
         """
         Blinks all active LEDs red until they are detected or timeout occurs.
         """
+        # Resolve loop invariants once instead of on every pin of every phase
+        LED_COUNT = self.LED_COUNT
+        max_pin = LED_COUNT * len(self.stripall)
+        strip0 = self.stripall[0]
+        strip1 = self.stripall[1] if len(self.stripall) > 1 else None
+        loop = asyncio.get_running_loop()
+        red = Color(255, 0, 0)
+        off = Color(0, 0, 0)
+        # Per-strip (index, color) buffers, reused by every phase
+        strip_updates = {strip: [] for strip in self.stripall}
         try:
             while True:
                 if self.blink_event.is_set():
                     break  # Exit if the event is set
 
                 try:
+                    # Only snapshot the shared state under the lock; pixel writes
+                    # and strip.show() happen after it is released.
                     async with self.lock:
                         current_time = time.time()
                         leds_to_remove = []
-                        strip_updates = {}
+                        pins_snapshot = []
 
-                        # Handle active blinking LEDs
-                        for led_pin, last_update in list(self.active_led_pins.items()):
+                        for led_pin, last_update in self.active_led_pins.items():
                             if current_time - last_update > self.timeout:
                                 leds_to_remove.append(led_pin)
-                                continue
-
-                            if led_pin < 1 or led_pin > self.LED_COUNT * len(self.stripall):
-                                logging.error(f"LED pin {led_pin} is out of range.")
-                                continue
-
-                            # Determine which strip the LED belongs to
-                            if led_pin <= self.LED_COUNT:
-                                strip = self.stripall[0]
-                                adjusted_led = led_pin - 1
                             else:
-                                strip = self.stripall[1]
-                                adjusted_led = led_pin - self.LED_COUNT - 1
-
-                            if strip not in strip_updates:
-                                strip_updates[strip] = []
-                            strip_updates[strip].append((adjusted_led, Color(255, 0, 0)))  # Red color
+                                pins_snapshot.append(led_pin)
 
                         # Remove LEDs that have timed out
                         for led_pin in leds_to_remove:
                             del self.active_led_pins[led_pin]
-                            await self.turn_off_led(led_pin)
-                            logging.info(f"LED {led_pin} turned off due to timeout.")
 
                         # If no more LEDs to blink and no active blocks, exit the task
-                        if not self.active_led_pins and not self.blocks and self.mode != 'block':
-                            logging.info("No active LEDs or blocks left to blink. Stopping blink task.")
-                            break
+                        keep_blinking = self.active_led_pins or self.blocks or self.mode == 'block'
+
+                    for led_pin in leds_to_remove:
+                        await self.turn_off_led(led_pin)
+                        logging.info(f"LED {led_pin} turned off due to timeout.")
+
+                    if not keep_blinking:
+                        logging.info("No active LEDs or blocks left to blink. Stopping blink task.")
+                        break
+
+                    for updates in strip_updates.values():
+                        updates.clear()
+                    for led_pin in pins_snapshot:
+                        if led_pin < 1 or led_pin > max_pin:
+                            logging.error(f"LED pin {led_pin} is out of range.")
+                            continue
+
+                        # Determine which strip the LED belongs to
+                        if led_pin <= LED_COUNT:
+                            strip = strip0
+                            adjusted_led = led_pin - 1
+                        else:
+                            strip = strip1
+                            adjusted_led = led_pin - LED_COUNT - 1
 
-                        # Update all strips at once
-                        for strip, updates in strip_updates.items():
-                            for idx, color in updates:
-                                strip.setPixelColor(idx, color)
-                            await asyncio.get_event_loop().run_in_executor(None, strip.show)
+                        strip_updates[strip].append((adjusted_led, red))
+
+                    # Update all strips at once
+                    for strip, updates in strip_updates.items():
+                        for idx, color in updates:
+                            strip.setPixelColor(idx, color)
+                    # The strips share one DMA channel, so render them one at a time
+                    for strip, updates in strip_updates.items():
+                        if updates:
+                            await loop.run_in_executor(None, strip.show)
 
                 except Exception as e:
                     logging.error(f"Error in blink_leds loop: {e}")
 
-                await asyncio.sleep(0.5)
-
-                if self.blink_event.is_set():
+                # Wait out the "on" phase, waking immediately if stopped
+                try:
+                    await asyncio.wait_for(self.blink_event.wait(), 0.5)
                     break  # Exit if the event is set
+                except asyncio.TimeoutError:
+                    pass
 
                 # Turn off all active LEDs
                 async with self.lock:
-                    strip_updates = {}
-                    for led_pin in self.active_led_pins.keys():
-                        if led_pin <= self.LED_COUNT:
-                            strip = self.stripall[0]
-                            adjusted_led = led_pin - 1
-                        else:
-                            strip = self.stripall[1]
-                            adjusted_led = led_pin - self.LED_COUNT - 1
+                    pins_snapshot = tuple(self.active_led_pins)
+
+                for updates in strip_updates.values():
+                    updates.clear()
+                for led_pin in pins_snapshot:
+                    if led_pin < 1 or led_pin > max_pin:
+                        continue
+                    if led_pin <= LED_COUNT:
+                        strip = strip0
+                        adjusted_led = led_pin - 1
+                    else:
+                        strip = strip1
+                        adjusted_led = led_pin - LED_COUNT - 1
 
-                        if strip not in strip_updates:
-                            strip_updates[strip] = []
-                        strip_updates[strip].append((adjusted_led, Color(0, 0, 0)))  # Turn off
+                    strip_updates[strip].append((adjusted_led, off))
 
-                    # Update all strips at once
-                    for strip, updates in strip_updates.items():
-                        for idx, color in updates:
-                            strip.setPixelColor(idx, color)
-                        await asyncio.get_event_loop().run_in_executor(None, strip.show)
+                # Update all strips at once
+                for strip, updates in strip_updates.items():
+                    for idx, color in updates:
+                        strip.setPixelColor(idx, color)
+                for strip, updates in strip_updates.items():
+                    if updates:
+                        await loop.run_in_executor(None, strip.show)
 
-                await asyncio.sleep(0.5)
+                # Wait out the "off" phase, waking immediately if stopped
+                try:
+                    await asyncio.wait_for(self.blink_event.wait(), 0.5)
+                    break  # Exit if the event is set
+                except asyncio.TimeoutError:
+                    pass
         except asyncio.CancelledError:
             logging.info("Blink task was cancelled.")
         finally:
@@ -0,0 +1,26 @@
+# data/json_codec.py
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+def dumps_json(data):
+    """Serialize data to a compact JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+def dump_project_bytes(data):
+    """Serialize project data to indented UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+
+def load_project_bytes(content):
+    """Parse project JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
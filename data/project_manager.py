@@ -1,12 +1,73 @@
 # data/project_manager.py
 
+import hashlib
 import json
 import os
 import logging
+import shutil
 import time
 from tkinter import messagebox, filedialog
 import asyncio
+from queue import Queue, Empty
 import aiofiles
+from .json_codec import dump_project_bytes
+
+# Size of each write handed to aiofiles when saving project data
+WRITE_CHUNK_SIZE = 1 << 16
+
+# Dialogs requested by the loaders and savers below. Those run in worker
+# threads or on the asyncio loop, where Tk must not be touched, so the
+# dialogs are queued and shown by show_pending_messages() on the Tk thread.
+_pending_messages = Queue()
+
+def _queue_message(dialog, title, message):
+    """Queue a messagebox dialog to be shown from the Tk thread."""
+    _pending_messages.put((dialog, title, message))
+
+def show_pending_messages():
+    """Show all queued dialogs. Must be called from the Tk thread."""
+    while True:
+        try:
+            dialog, title, message = _pending_messages.get_nowait()
+        except Empty:
+            return
+        dialog(title, message)
+
+# Digest of the last content written per project file, used to skip saves
+# (and their backups) when nothing changed.
+_last_saved_digest = {}
+
+# Last resolved data file per (base_dir, project key). Lets the async loader
+# read projects.json and the data file concurrently on repeat loads.
+_data_file_cache = {}
+
+def _read_json(path):
+    """Read and parse a JSON file."""
+    with open(path, 'r') as file:
+        return json.load(file)
+
+def _flatten_led_data(data):
+    """Flatten {regal: {led_id: attrs}} into {"<regal>_<led_id>": attrs}."""
+    led_data = {}
+    for regal_name, leds in data.items():
+        # Build the key prefix once per regal instead of formatting per LED
+        prefix = regal_name + '_'
+        for led_id, attributes in leds.items():
+            get = attributes.get
+            led_data[prefix + led_id] = {
+                'FILE': get('FILE', ''),
+                'selected': get('selected', False),
+                'order': get('order')
+            }
+    return led_data
+
+def _link_or_copy(src, dst):
+    """Hard-link dst to src, copying the data only when linking is not possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Cross-device or a filesystem without hard links
+        shutil.copyfile(src, dst)
 
 async def backup_file_async(file_path):
     """Asynchronously create a backup of the specified file."""
@@ -14,9 +75,7 @@ async def backup_file_async(file_path):
         return
     backup_path = f"{file_path}.backup.{int(time.time())}"
     try:
-        async with aiofiles.open(file_path, 'rb') as src, aiofiles.open(backup_path, 'wb') as dst:
-            content = await src.read()
-            await dst.write(content)
+        await asyncio.to_thread(_link_or_copy, file_path, backup_path)
         logging.info(f"Created backup of {file_path} at {backup_path}")
     except Exception as e:
         logging.error(f"Failed to create backup for {file_path}: {e}")
@@ -28,8 +87,7 @@ def backup_file(file_path):
         return
     backup_path = f"{file_path}.backup.{int(time.time())}"
     try:
-        with open(file_path, 'rb') as src, open(backup_path, 'wb') as dst:
-            dst.write(src.read())
+        _link_or_copy(file_path, backup_path)
         logging.info(f"Created backup of {file_path} at {backup_path}")
     except Exception as e:
         logging.error(f"Failed to create backup for {file_path}: {e}")
@@ -64,26 +122,26 @@ def load_project_mapping_sync(selected_project, base_dir):
         with open(master_json_path, 'r') as file:
             projects = json.load(file)
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to load master project file:\n{e}")
+        _queue_message(messagebox.showerror, "Error", f"Failed to load master project file:\n{e}")
         logging.error(f"Error loading master project file: {e}")
         return {}
 
     # Extract the project number from the selected project name
     project_number = ''.join(filter(str.isdigit, selected_project))
     if not project_number:
-        messagebox.showerror("Invalid Project", "Selected project name does not contain a number.")
+        _queue_message(messagebox.showerror, "Invalid Project", "Selected project name does not contain a number.")
         logging.error("Selected project name does not contain a number.")
         return {}
 
     project_key = project_number  # Assuming the key in master JSON is the number
     if project_key not in projects:
-        messagebox.showerror("Project Not Found", f"No project found with key: {project_key}")
+        _queue_message(messagebox.showerror, "Project Not Found", f"No project found with key: {project_key}")
         logging.error(f"No project found with key: {project_key}")
         return {}
 
     data_file = projects[project_key].get("FILE", "")
     if not data_file:
-        messagebox.showerror("Invalid Project Entry", f"No 'FILE' field found for project {selected_project}.")
+        _queue_message(messagebox.showerror, "Invalid Project Entry", f"No 'FILE' field found for project {selected_project}.")
         logging.error(f"No 'FILE' field in project {selected_project}.")
         return {}
 
@@ -92,46 +150,62 @@ def load_project_mapping_sync(selected_project, base_dir):
 
     # Load the data file specified in the 'FILE' field
     if not os.path.isfile(absolute_data_file):
-        messagebox.showerror("File Not Found", f"Data file for {selected_project} not found at {absolute_data_file}.")
+        _queue_message(messagebox.showerror, "File Not Found", f"Data file for {selected_project} not found at {absolute_data_file}.")
         logging.error(f"Data file not found: {absolute_data_file}")
         return {}
 
     try:
-        with open(absolute_data_file, 'r') as file:
-            data = json.load(file)
-            logging.info(f"Loaded data from {absolute_data_file}")
-            led_data = {}
-            for regal_name, leds in data.items():
-                for led_id, attributes in leds.items():
-                    unique_led_key = f"{regal_name}_{led_id}"
-                    led_data[unique_led_key] = {
-                        'FILE': attributes.get('FILE', ''),
-                        'selected': attributes.get('selected', False),
-                        'order': attributes.get('order', None)
-                    }
-            return led_data
+        data = _read_json(absolute_data_file)
+        logging.info(f"Loaded data from {absolute_data_file}")
+        _data_file_cache[(base_dir, project_key)] = absolute_data_file
+        return _flatten_led_data(data)
     except json.JSONDecodeError as e:
-        messagebox.showerror("JSON Error", f"Failed to parse data file:\n{e}")
+        _queue_message(messagebox.showerror, "JSON Error", f"Failed to parse data file:\n{e}")
         logging.error(f"Data file JSON parsing error: {e}")
         return {}
     except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while loading the data file:\n{e}")
+        _queue_message(messagebox.showerror, "Error", f"An error occurred while loading the data file:\n{e}")
         logging.error(f"Error loading data file: {e}")
         return {}
 
 async def load_project_mapping_async(selected_project, base_dir):
     """Asynchronously load project mapping."""
-    return await asyncio.to_thread(load_project_mapping_sync, selected_project, base_dir)
+    project_key = ''.join(filter(str.isdigit, selected_project))
+    predicted_data_file = _data_file_cache.get((base_dir, project_key))
+    if predicted_data_file is None:
+        return await asyncio.to_thread(load_project_mapping_sync, selected_project, base_dir)
+
+    # The data file is known from a previous load: read both files at once
+    master_json_path = os.path.join(base_dir, "projects.json")
+    try:
+        projects, data = await asyncio.gather(
+            asyncio.to_thread(_read_json, master_json_path),
+            asyncio.to_thread(_read_json, predicted_data_file)
+        )
+    except Exception:
+        data = None
+    else:
+        data_file = projects.get(project_key, {}).get("FILE", "")
+        if not data_file or os.path.join(base_dir, data_file) != predicted_data_file:
+            data = None
+
+    if data is None:
+        # Stale prediction or read error: take the regular path, which reports errors
+        _data_file_cache.pop((base_dir, project_key), None)
+        return await asyncio.to_thread(load_project_mapping_sync, selected_project, base_dir)
+
+    logging.info(f"Loaded data from {predicted_data_file}")
+    return _flatten_led_data(data)
 
 async def save_project_json_async(selected_project, led_data, base_dir):
     """Asynchronously save the current LED data back to the project's JSON file."""
     if not selected_project:
-        messagebox.showwarning("No Project Selected", "Please select a project before saving.")
+        _queue_message(messagebox.showwarning, "No Project Selected", "Please select a project before saving.")
         return
 
     project_number = ''.join(filter(str.isdigit, selected_project))
     if not project_number:
-        messagebox.showerror("Invalid Project", "Selected project name does not contain a number.")
+        _queue_message(messagebox.showerror, "Invalid Project", "Selected project name does not contain a number.")
         logging.error("Selected project name does not contain a number.")
         return
 
@@ -141,19 +215,19 @@ async def save_project_json_async(selected_project, led_data, base_dir):
         with open(master_json_path, 'r') as file:
             projects = json.load(file)
     except Exception as e:
-        messagebox.showerror("Error", f"Failed to load master project file:\n{e}")
+        _queue_message(messagebox.showerror, "Error", f"Failed to load master project file:\n{e}")
         logging.error(f"Error loading master project file: {e}")
         return
 
     project_key = project_number
     if project_key not in projects:
-        messagebox.showerror("Project Not Found", f"No project found with key: {project_key}")
+        _queue_message(messagebox.showerror, "Project Not Found", f"No project found with key: {project_key}")
         logging.error(f"No project found with key: {project_key}")
         return
 
     data_file = projects[project_key].get("FILE", "")
     if not data_file:
-        messagebox.showerror("Invalid Project Entry", f"No 'FILE' field found for project {selected_project}.")
+        _queue_message(messagebox.showerror, "Invalid Project Entry", f"No 'FILE' field found for project {selected_project}.")
         logging.error(f"No 'FILE' field in project {selected_project}.")
         return
 
@@ -164,14 +238,13 @@ async def save_project_json_async(selected_project, led_data, base_dir):
         # Ensure the directory exists
         os.makedirs(os.path.dirname(json_file_path), exist_ok=True)
 
-        # Backup the existing project JSON if it exists
-        if os.path.isfile(json_file_path):
-            await backup_file_async(json_file_path)
-
         # Reconstruct the JSON structure based on regals with relative paths
         json_data = {}
         for led_key, attributes in led_data.items():
-            regal_name, led_id = led_key.split('_')
+            regal_name, sep, led_id = led_key.rpartition('_')
+            if not sep:
+                logging.warning(f"Skipping malformed LED key: {led_key}")
+                continue
             if regal_name not in json_data:
                 json_data[regal_name] = {}
             # Compute relative path if necessary
@@ -186,10 +259,38 @@ async def save_project_json_async(selected_project, led_data, base_dir):
                 'order': attributes.get('order', None)
             }
 
-        async with aiofiles.open(json_file_path, 'w', encoding='utf-8') as file:
-            await file.write(json.dumps(json_data, indent=4, ensure_ascii=False))
-        messagebox.showinfo("Success", f"Project data saved successfully to {json_file_path}.")
+        content = dump_project_bytes(json_data)
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        file_exists = os.path.isfile(json_file_path)
+        if file_exists and _last_saved_digest.get(json_file_path) == digest:
+            _queue_message(messagebox.showinfo, "No Changes", "Project data is unchanged since the last save.")
+            logging.info(f"Project data unchanged, skipped saving {json_file_path}")
+            return
+
+        # Backup the existing project JSON if it exists
+        if file_exists:
+            await backup_file_async(json_file_path)
+
+        # Write in chunks so the executor thread is released between writes.
+        # The data goes to a temporary file that then replaces the original,
+        # so a hard-linked backup keeps the previous contents and a failed
+        # save never leaves a half-written project file behind.
+        tmp_file_path = f"{json_file_path}.tmp"
+        try:
+            async with aiofiles.open(tmp_file_path, 'wb') as file:
+                for start in range(0, len(content), WRITE_CHUNK_SIZE):
+                    await file.write(content[start:start + WRITE_CHUNK_SIZE])
+            os.replace(tmp_file_path, json_file_path)
+        except BaseException:
+            # Don't leave the partial temporary file next to the project file
+            try:
+                os.remove(tmp_file_path)
+            except OSError:
+                pass
+            raise
+        _last_saved_digest[json_file_path] = digest
+        _queue_message(messagebox.showinfo, "Success", f"Project data saved successfully to {json_file_path}.")
         logging.info(f"Saved project data to {json_file_path}")
     except Exception as e:
-        messagebox.showerror("Error", f"An error occurred while saving the JSON file:\n{e}")
+        _queue_message(messagebox.showerror, "Error", f"An error occurred while saving the JSON file:\n{e}")
         logging.error(f"Error saving JSON file: {e}")
\ No newline at end of file
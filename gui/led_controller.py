@@ -4,13 +4,16 @@ import asyncio
 import threading
 import logging
 import os
-import json
-from functools import partial
+import colorsys
+from pathlib import Path, PurePosixPath
+from functools import partial, lru_cache
 from queue import Queue, Empty
-from aiohttp import web, ClientSession
+from collections import deque
+from aiohttp import web, ClientSession, ClientTimeout, TCPConnector
 import aiofiles
-import colorsys
 from config import config
+from network.run_server import new_event_loop
+from data.json_codec import dumps_json, dump_project_bytes, load_project_bytes
 
 # ============================
 # ToolTip Class (Utility)
@@ -19,7 +22,12 @@ from config import config
 class ToolTip:
     """
     It creates a tooltip for a given widget as the mouse goes on it.
+
+    All tooltips share one hidden Toplevel that is repositioned on hover.
     """
+    shared_tw = None
+    shared_label = None
+    active = None  # ToolTip currently showing the shared window
     def __init__(self, widget, text='widget info'):
         self.waittime = 500  # milliseconds
         self.wraplength = 180  # pixels
@@ -53,21 +61,98 @@ class ToolTip:
         # Position the tooltip below and to the right of the widget
         x = self.widget.winfo_rootx() + 25
         y = self.widget.winfo_rooty() + 20
-        # creates a toplevel window
-        self.tw = tk.Toplevel(self.widget)
-        # Leaves only the label and removes the app window
-        self.tw.wm_overrideredirect(True)
-        self.tw.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(self.tw, text=self.text, justify='left',
-                         background="#ffffe0", relief='solid', borderwidth=1,
-                         wraplength=self.wraplength)
-        label.pack(ipadx=1)
+        tw = ToolTip.shared_tw
+        if tw is None or not tw.winfo_exists():
+            # creates the shared toplevel window on first use
+            tw = tk.Toplevel(self.widget._root())
+            # Leaves only the label and removes the app window
+            tw.wm_overrideredirect(True)
+            tw.withdraw()
+            ToolTip.shared_label = tk.Label(tw, justify='left',
+                                            background="#ffffe0", relief='solid', borderwidth=1)
+            ToolTip.shared_label.pack(ipadx=1)
+            ToolTip.shared_tw = tw
+        ToolTip.shared_label.configure(text=self.text, wraplength=self.wraplength)
+        tw.wm_geometry(f"+{x}+{y}")
+        tw.deiconify()
+        tw.lift()
+        ToolTip.active = self
+        self.tw = tw
 
     def hidetip(self):
         tw = self.tw
         self.tw = None
-        if tw:
-            tw.destroy()
+        if tw and ToolTip.active is self:
+            ToolTip.active = None
+            if tw.winfo_exists():
+                tw.withdraw()
+
+# ============================
+# Project Data Helpers
+# ============================
+
+def copy_project_data(data):
+    """Copy project data down to the per-LED dicts and the selected_order list."""
+    return {
+        key: ({led_id: dict(info) for led_id, info in value.items()} if isinstance(value, dict)
+              else list(value) if isinstance(value, list) else value)
+        for key, value in data.items()
+    }
+
+# ============================
+# Color Helpers
+# ============================
+
+@lru_cache(maxsize=64)
+def darken_color(color, factor=0.9, perceptual=False):
+    """
+    Darken the given color by the given factor.
+    Scales each RGB channel, or the HLS lightness when perceptual is True.
+    """
+    color = color.lstrip('#')
+    if not perceptual:
+        r = min(255, int(int(color[0:2], 16) * factor))
+        g = min(255, int(int(color[2:4], 16) * factor))
+        b = min(255, int(int(color[4:6], 16) * factor))
+        return f'#{r:02x}{g:02x}{b:02x}'
+    rgb = tuple(int(color[i:i+2], 16)/255.0 for i in (0, 2, 4))
+    h, l, s = colorsys.rgb_to_hls(*rgb)
+    l = max(0, min(1, l * factor))
+    r, g, b = colorsys.hls_to_rgb(h, l, s)
+    return f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
+
+# Styles for specific buttons
+_BUTTON_STYLES = {
+    'Activate.TButton': {'foreground': 'white', 'background': '#28a745', 'font': ('Helvetica', 12, 'bold')},
+    'Undo.TButton': {'foreground': 'white', 'background': '#6c757d', 'font': ('Helvetica', 12, 'bold')},
+    'Redo.TButton': {'foreground': 'white', 'background': '#17a2b8', 'font': ('Helvetica', 12, 'bold')},
+    'SwitchMode.TButton': {'foreground': 'white', 'background': '#343a40', 'font': ('Helvetica', 12, 'bold')},
+    'Clear.TButton': {'foreground': 'white', 'background': '#fd7e14', 'font': ('Helvetica', 12, 'bold')},
+    'Exit.TButton': {'foreground': 'white', 'background': '#dc3545', 'font': ('Helvetica', 12, 'bold')},
+    'Edit.TButton': {'foreground': 'white', 'background': '#ff0000', 'font': ('Helvetica', 10, 'bold')},
+    'EditSave.TButton': {'foreground': 'white', 'background': '#007bff', 'font': ('Helvetica', 12, 'bold')},
+    'Remove.TButton': {'foreground': 'white', 'background': '#dc3545', 'font': ('Helvetica', 10, 'bold')},
+}
+
+# Styles whose hover color visibly shifts with plain RGB scaling; these keep the HLS tint
+_PERCEPTUAL_HOVER_STYLES = {'Activate.TButton', 'Clear.TButton', 'Exit.TButton', 'Remove.TButton'}
+
+# Every style setting of the application, applied by define_styles in one
+# Tcl evaluation. Hover backgrounds are computed once at import.
+_THEME_SETTINGS = {
+    'TFrame': {'configure': {'background': '#f0f0f0'}},
+    'TLabel': {'configure': {'background': '#f0f0f0', 'font': ("Helvetica", 11)}},
+    'TButton': {'configure': {'font': ("Helvetica", 11)}},
+    'TEntry': {'configure': {'font': ("Helvetica", 11)}},
+    **{
+        name: {
+            'configure': cfg,
+            'map': {'foreground': [('active', 'white')],
+                    'background': [('active', darken_color(cfg['background'], 0.9, name in _PERCEPTUAL_HOVER_STYLES))]},
+        }
+        for name, cfg in _BUTTON_STYLES.items()
+    },
+}
 
 # ============================
 # Configuration and Mock Implementations
@@ -133,14 +218,12 @@ async def load_project_mapping_async(project_name, base_dir):
             },
             "selected_order": []
         }
-        async with aiofiles.open(project_file, mode='w') as f:
-            content = json.dumps(default_data, indent=4)
-            await f.write(content)
+        async with aiofiles.open(project_file, mode='wb') as f:
+            await f.write(dump_project_bytes(default_data))
 
-    async with aiofiles.open(project_file, mode='r') as f:
+    async with aiofiles.open(project_file, mode='rb') as f:
         content = await f.read()
-        data = json.loads(content)
-    return data
+    return load_project_bytes(content)
 
 async def save_project_json_async(project_name, led_data, base_dir):
     """
@@ -149,17 +232,37 @@ async def save_project_json_async(project_name, led_data, base_dir):
     """
     project_file = os.path.join(base_dir, "projects", f"{project_name}.json")
     os.makedirs(os.path.dirname(project_file), exist_ok=True)
-    async with aiofiles.open(project_file, mode='w') as f:
-        content = json.dumps(led_data, indent=4)
+    # Serializing a large project takes a while, so keep it off the event loop
+    content = await asyncio.to_thread(dump_project_bytes, led_data)
+    async with aiofiles.open(project_file, mode='wb') as f:
         await f.write(content)
 
+# ============================
+# Per-LED State
+# ============================
+
+class LedState:
+    """Widgets and identity of a single LED, plus the detail state last shown."""
+    __slots__ = ('var', 'canvas', 'circle', 'detail_label', 'edit_button', 'regal', 'led_id', 'applied', 'source')
+
+    def __init__(self, var, canvas, circle, detail_label, edit_button, regal, led_id):
+        self.var = var
+        self.canvas = canvas
+        self.circle = circle
+        self.detail_label = detail_label
+        self.edit_button = edit_button
+        self.regal = regal
+        self.led_id = led_id
+        self.applied = None  # (detail text, selected) last applied to the widgets
+        self.source = None  # (order positions, file text) the applied state was built from
+
 # ============================
 # Mock Regal Class
 # ============================
 
 class Regal:
     """Mock implementation of the Regal class."""
-    def __init__(self, display_name, internal_name, led_data, controller, max_leds_per_row):
+    def __init__(self, display_name, internal_name, led_data, controller, max_leds_per_row, populate=True):
         self.display_name = display_name
         self.internal_name = internal_name
         self.led_data = led_data
@@ -170,57 +273,66 @@ class Regal:
         self.container = ttk.LabelFrame(controller.led_frame, text=self.display_name)
         self.container.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
         controller.regal_frames[self.internal_name] = self.container
+        controller.regals[self.internal_name] = self
 
-        # Populate LEDs
-        self.populate_leds()
+        # Populate LEDs, unless the caller adds them itself in chunks
+        self.led_frames = []
+        if populate:
+            self.populate_leds()
 
     def populate_leds(self):
         """Populate LEDs in the regal."""
-        row = 0
-        col = 0
         for led_id, led_info in self.led_data.items():
+            self.add_led(led_id, led_info)
+
+    def add_led(self, led_id, led_info, led_key=None):
+        """Create the widgets for one LED in the next free grid cell."""
+        if led_key is None:
             led_key = self.controller.generate_unique_led_key(self.internal_name, led_id)
-            led_var = tk.IntVar(value=0)
-            self.controller.led_vars[led_key] = led_var
-
-            # Create a frame for each LED
-            led_frame = ttk.Frame(self.container)
-            led_frame.grid(row=row, column=col, padx=5, pady=5)
-
-            # Create a canvas to represent the LED
-            led_canvas = tk.Canvas(led_frame, width=30, height=30)  # Increased size for better visibility
-            led_circle = led_canvas.create_oval(5, 5, 25, 25, fill='grey')
-            # Add LED number inside the circle
-            led_canvas.create_text(15, 15, text=str(led_id), fill='white', font=('Helvetica', 10, 'bold'))
-            led_canvas.pack()
-            self.controller.led_buttons[led_key] = (led_canvas, led_circle)
-
-            # Bind click events
-            led_canvas.bind("<Button-1>", lambda event, key=led_key: self.controller.on_led_toggle_canvas(key, event))
-            led_canvas.bind("<Button-3>", lambda event, key=led_key: self.controller.on_led_toggle_canvas(key, event))
-            ToolTip(led_canvas, "Left-click to select LED\nRight-click to deselect LED")
-
-            # LED detail label
-            detail_label = ttk.Label(led_frame, text=f"FILE: {led_info.get('FILE', '')}")
-            detail_label.pack()
-            self.controller.led_detail_labels[led_key] = detail_label
-
-            # Edit button
-            edit_button = ttk.Button(
-                led_frame,
-                text="Edit",
-                command=lambda key=led_key: self.controller.open_edit_window(key),
-                state='disabled',
-                style='Edit.TButton'
-            )
-            edit_button.pack(pady=2)
-            self.controller.led_edit_buttons[led_key] = edit_button
+        led_var = tk.IntVar(value=0)
+
+        # Create a frame for each LED
+        per_row = max(self.max_leds_per_row, 1)
+        index = len(self.led_frames)
+        led_frame = ttk.Frame(self.container)
+        led_frame.grid(row=index // per_row, column=index % per_row, padx=5, pady=5)
+        self.led_frames.append(led_frame)
+
+        # Create a canvas to represent the LED
+        led_canvas = tk.Canvas(led_frame, width=30, height=30)  # Increased size for better visibility
+        led_circle = led_canvas.create_oval(5, 5, 25, 25, fill='grey')
+        # Add LED number inside the circle
+        led_canvas.create_text(15, 15, text=str(led_id), fill='white', font=('Helvetica', 10, 'bold'))
+        led_canvas.pack()
+
+        # Click events are handled by the controller's LedCanvas class binding
+        led_canvas.bindtags(('LedCanvas',) + led_canvas.bindtags())
+        self.controller.canvas_led_keys[str(led_canvas)] = led_key
+        ToolTip(led_canvas, "Left-click to select LED\nRight-click to deselect LED")
+
+        # LED detail label
+        detail_label = ttk.Label(led_frame, text=f"FILE: {led_info.get('FILE', '')}")
+        detail_label.pack()
+
+        # Edit button
+        edit_button = ttk.Button(
+            led_frame,
+            text="Edit",
+            command=partial(self.controller.open_edit_window, led_key),
+            state='disabled',
+            style='Edit.TButton'
+        )
+        edit_button.pack(pady=2)
+
+        self.controller.leds[led_key] = LedState(
+            led_var, led_canvas, led_circle, detail_label, edit_button, self.internal_name, led_id
+        )
 
-            # Next LED position
-            col += 1
-            if col >= self.max_leds_per_row:
-                col = 0
-                row += 1
+    def reflow(self, max_leds_per_row):
+        """Re-grid the existing LED frames for a new number of LEDs per row."""
+        self.max_leds_per_row = max_leds_per_row
+        for i, led_frame in enumerate(self.led_frames):
+            led_frame.grid_configure(row=i // max_leds_per_row, column=i % max_leds_per_row)
 
 # ============================
 # LEDController Class
@@ -235,25 +347,49 @@ class LEDController:
 
         # Define base directory
         self.BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+        self.BASE_PATH = Path(self.BASE_DIR).resolve()
 
         # Initialize variables
         self.current_mode = 'two_regals'
+        # (regal name, mode) in priority order; projects matching none use 'two_regals'
+        self.MODE_RULES = (('benti regal', 'benti_regal'), ('regal1', 'two_regals'), ('regal2', 'two_regals'))
+        # Shelf number per lower-cased regal name; unknown regals map to "0"
+        self.SHELF_NUMBERS = {"regal1": "1", "regal2": "2", "benti regal": "1"}
         self.selected_order = []
-        self.led_vars = {}
-        self.led_buttons = {}  # Store references to LED canvas and circle
-        self.led_detail_labels = {}
-        self.led_edit_buttons = {}
-        self.led_id_to_regal = {}
+        self.order_index = {}  # Key: led_key, Value: positions in selected_order
+        self.led_key_components = {}  # Key: led_key, Value: (regal_name, led_id)
+        self.led_path_cache = {}  # Key: led_key, Value: FILE path
+        self.led_file_text = {}  # Key: led_key, Value: "FILE: ..." label text
+        self.leds = {}  # Key: led_key, Value: LedState
+        self.canvas_led_keys = {}  # Key: LED canvas path name, Value: led_key
+        self.suspend_label_updates = False  # While set, update_led_detail only records the key
+        self.pending_labels = set()
+        self.dirty_leds = set()  # LEDs waiting for flush_dirty_leds
+        self.dirty_flush_job = None
         self.regal_frames = {}
+        self.regals = {}  # Key: regal_name, Value: Regal
+        # Regals shown in each mode, and those show_current_mode last packed
+        self.MODE_REGALS = {'two_regals': ("Regal1", "Regal2"), 'benti_regal': ("Benti Regal",)}
+        self.shown_regals = None
+        self.LED_BUILD_CHUNK = 50  # LED widgets built per idle callback
+        self.led_build_job = None
+        self.led_build_on_done = None  # on_done of the build led_build_job belongs to
         self.MAX_SELECTION = 100
+        self.LEDS_URL = "http://127.0.0.1:1080/pick/leds"
 
         self.LED_CONTROL = config.LED_CONTROL
         self.MAX_LEDS_ROW = config.MAX_LEDS_ROW
         self.WINDOWS = config.WINDOWS
 
-        # Initialize stacks for undo and redo
-        self.undo_stack = []
-        self.redo_stack = []
+        # Initialize stacks for undo and redo, keeping the most recent entries
+        self.UNDO_HISTORY = 200
+        self.undo_stack = deque(maxlen=self.UNDO_HISTORY)
+        self.redo_stack = deque(maxlen=self.UNDO_HISTORY)
+
+        # Operations recorded within UNDO_BATCH_MS of each other undo together
+        self.UNDO_BATCH_MS = 50
+        self.undo_batch = []
+        self.undo_batch_job = None
 
         # Selected project
         self.selected_project = None
@@ -262,26 +398,55 @@ class LEDController:
 
         # LED data loaded from JSON
         self.led_data = {}  # Key: regal_name, Value: {led_id: {...}, ...}
+        self.flat_leds = []  # (regal_name, led_id, led_key, led_info) for every LED
+        self.shelf_numbers = {}  # Key: regal_name, Value: shelf number
+        self.led_payloads = {}  # Key: led_key, Value: led_sequence entry sent to the LED server
+        self.project_cache = {}  # Key: project name, Value: ((mtime_ns, size), parsed project data)
 
         # Currently selected LED for editing
         self.current_edit_led = None
 
+        # Edit window, built on first open and reused for every LED
+        self.edit_window = None
+        self.edit_file_var = None
+
+        # Settings window, built on first open and reused afterwards
+        self.settings_window = None
+        self.settings_vars = None
+
         # Configure logging
         self.configure_logging()
 
+        # Queue for callbacks handed from the asyncio thread to the GUI thread.
+        # Where Tk can watch a wake-up pipe, each callback wakes Tk as it is
+        # queued and nothing polls; otherwise (Windows) the queue is polled at
+        # an interval (ms) that drops while busy and backs off when idle.
+        # Set up before the loop thread starts so call_in_gui always sees it.
+        self.queue = Queue()
+        self.DIALOG_CALLBACKS = (messagebox.showinfo, messagebox.showwarning, messagebox.showerror)
+        # Idempotent refreshes; identical queued calls to these run only once per drain
+        self.COALESCED_CALLBACKS = (self.update_led_detail, self.set_available_projects)
+        self.QUEUE_POLL_MIN_MS = 5
+        self.QUEUE_POLL_MAX_MS = 50
+        self.queue_poll_interval = self.QUEUE_POLL_MIN_MS
+        self.setup_queue_wakeup()
+        if self.wakeup_fds is None:
+            self.process_queue()
+
         # Initialize asyncio event loop in a separate thread
-        self.loop = asyncio.new_event_loop()
+        self.BLOCK_QUEUE_SIZE = 16
+        self.LED_REQUEST_TIMEOUT = 10  # seconds
+        self.queued_work = set()  # (coroutine function, args) waiting in work_queue; loop thread only
+        # Backed by uvloop when available, like the LED server's loop
+        self.loop = new_event_loop()
+        self.loop_ready = threading.Event()
         self.loop_thread = threading.Thread(target=self.start_event_loop, daemon=True)
         self.loop_thread.start()
 
-        # Queue for inter-thread communication
-        self.queue = Queue()
-
-        # Start the queue processing
-        self.process_queue()
-
-        # Initialize aiohttp session
-        self.session = ClientSession(loop=self.loop)
+        # Wait for startup() to create the aiohttp session and start the
+        # server. Coroutines started from the GUI thread from here on go
+        # through submit_work rather than touching self.loop.
+        self.loop_ready.wait()
 
         # Configure styles
         self.style = ttk.Style()
@@ -298,8 +463,10 @@ class LEDController:
 
     def configure_logging(self):
         """Configure logging for the application."""
+        # INFO by default; set LIDARGUI_LOGLEVEL=DEBUG for detailed logs
+        level_name = os.environ.get('LIDARGUI_LOGLEVEL', 'INFO').upper()
         logging.basicConfig(
-            level=logging.DEBUG,  # Set to DEBUG for detailed logs
+            level=getattr(logging, level_name, logging.INFO),
             format='%(asctime)s [%(levelname)s] %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
@@ -307,37 +474,120 @@ class LEDController:
     def start_event_loop(self):
         """Start the asyncio event loop."""
         asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.startup())
+        except Exception as e:
+            # Keep the loop running so queued work still completes (e.g. when
+            # port 8080 is taken and only the web server failed to start)
+            logging.error(f"Error during asyncio startup: {e}")
+        finally:
+            self.loop_ready.set()
+        self.loop.run_forever()
+
+    async def startup(self):
+        """Create the aiohttp session and start the web server on this loop."""
+        # A single kept-alive connection to the LED server is reused by every activation
+        self.session = ClientSession(
+            connector=TCPConnector(limit=1, keepalive_timeout=300),
+            # Requests run one at a time from the work queue, so never let one hang
+            timeout=ClientTimeout(total=self.LED_REQUEST_TIMEOUT),
+            json_serialize=dumps_json,
+        )
 
-        # Set up aiohttp web server
+        # block_completed notifications are queued on the loop and handed to
+        # the GUI thread by a single consumer task
+        self.block_queue = asyncio.Queue(maxsize=self.BLOCK_QUEUE_SIZE)
+        self.loop.create_task(self.consume_block_completed())
+
+        # User actions (load, save, activate) run one at a time from a work queue
+        self.work_queue = asyncio.Queue()
+        self.loop.create_task(self.consume_work())
+
+        # Set up aiohttp web server. Signals belong to the main (Tk) thread.
         app = web.Application()
         app.router.add_post('/block_completed', self.handle_block_completed)
-        runner = web.AppRunner(app)
-        self.loop.run_until_complete(runner.setup())
-        site = web.TCPSite(runner, 'localhost', 8080)
-        self.loop.run_until_complete(site.start())
+        runner = web.AppRunner(app, handle_signals=False)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, 'localhost', 8080).start()
+        except OSError as e:
+            logging.error(f"Failed to start aiohttp web server on port 8080: {e}")
+            return
         logging.info("Aiohttp web server started on port 8080")
 
-        self.loop.run_forever()
-
     async def handle_block_completed(self, request):
         """Handle block_completed notification from blink_manager."""
         logging.info("Received block_completed notification")
-        # Put a message into the queue to be processed by the GUI thread
-        self.queue.put(("block_completed", None))
+        # Waits here if the consumer falls behind, pushing back on the sender
+        await self.block_queue.put(request.path)
         return web.Response(text="OK")
 
+    async def consume_block_completed(self):
+        """Re-activate the selected LEDs for each queued block_completed notification."""
+        while True:
+            await self.block_queue.get()
+            # Already on the loop, so queue the activation directly instead of
+            # bouncing through the GUI thread and back
+            logging.info("Handling block completed")
+            self.enqueue_work((self.send_led_control_request_async, ()))
+            self.block_queue.task_done()
+
+    def submit_work(self, coro_func, *args):
+        """Queue coro_func(*args) to run on the event loop (GUI thread side)."""
+        self.loop.call_soon_threadsafe(self.enqueue_work, (coro_func, args))
+
+    def enqueue_work(self, item):
+        """Add a work item unless an identical one is already waiting (loop thread)."""
+        try:
+            if item in self.queued_work:
+                logging.debug("Dropping duplicate work item %s", item[0].__name__)
+                return
+            self.queued_work.add(item)
+        except TypeError:
+            pass  # Unhashable arguments are never merged
+        self.work_queue.put_nowait(item)
+
+    async def consume_work(self):
+        """Run queued work items in order on the event loop."""
+        while True:
+            item = await self.work_queue.get()
+            try:
+                self.queued_work.discard(item)
+            except TypeError:
+                pass
+            coro_func, args = item
+            try:
+                await coro_func(*args)
+            except Exception as e:
+                logging.error(f"Error running {coro_func.__name__}: {e}")
+            finally:
+                self.work_queue.task_done()
+
     def open_settings_window(self):
         """Open a window to edit configuration settings."""
+        # The window is built once and only hidden when closed
+        if self.settings_window is not None:
+            led_control_var, max_leds_row_var, windows_var = self.settings_vars
+            led_control_var.set(config.LED_CONTROL)
+            max_leds_row_var.set(config.MAX_LEDS_ROW)
+            windows_var.set(config.WINDOWS)
+            self.settings_window.deiconify()
+            self.settings_window.grab_set()
+            return
+
         # Create a new Toplevel window
         settings_window = tk.Toplevel(self.master)
         settings_window.title("Settings")
         settings_window.geometry("300x200")
         settings_window.grab_set()  # Make the window modal
+        settings_window.protocol("WM_DELETE_WINDOW", partial(self.hide_settings_window, settings_window))
+        self.settings_window = settings_window
 
         # Define variables to hold the settings
         led_control_var = tk.IntVar(value=config.LED_CONTROL)
         max_leds_row_var = tk.IntVar(value=config.MAX_LEDS_ROW)
         windows_var = tk.BooleanVar(value=config.WINDOWS)
+        self.settings_vars = (led_control_var, max_leds_row_var, windows_var)
 
         # LED_CONTROL
         led_control_frame = ttk.Frame(settings_window)
@@ -367,16 +617,22 @@ class LEDController:
         save_button = ttk.Button(
             settings_window,
             text="Save",
-            command=lambda: self.save_settings(
-                led_control_var.get(),
-                max_leds_row_var.get(),
-                windows_var.get(),
-                settings_window
-            )
+            command=self.submit_settings
         )
         save_button.pack(pady=10)
         ToolTip(save_button, "Save configuration settings")
 
+    def submit_settings(self):
+        """Save the values currently entered in the settings window."""
+        led_control_var, max_leds_row_var, windows_var = self.settings_vars
+        self.save_settings(led_control_var.get(), max_leds_row_var.get(), windows_var.get(),
+                           self.settings_window)
+
+    def hide_settings_window(self, window):
+        """Hide the settings window so the next open can reuse it."""
+        window.grab_release()
+        window.withdraw()
+
     def save_settings(self, led_control, max_leds_row, windows, window):
         """Save the settings and update the configuration."""
         # Update the config settings
@@ -393,49 +649,42 @@ class LEDController:
         config.save_settings(config.settings)
 
         # Close the settings window
-        window.destroy()
+        self.hide_settings_window(window)
 
         # Notify the user
         messagebox.showinfo("Settings Saved", "Configuration settings have been updated.")
 
         # Update internal variables
+        previous_max_leds_row = self.MAX_LEDS_ROW
         self.LED_CONTROL = config.LED_CONTROL
         self.MAX_LEDS_ROW = config.MAX_LEDS_ROW
         self.WINDOWS = config.WINDOWS
 
-        # Recreate the regal frames with the new settings
-        self.recreate_regal_frames()
+        # Only MAX_LEDS_ROW affects the regal layout, and the existing LED
+        # widgets can simply be re-gridded for it
+        if self.MAX_LEDS_ROW != previous_max_leds_row:
+            self.reflow_regal_frames()
+
+    def reflow_regal_frames(self):
+        """Lay out the existing LEDs for the current MAX_LEDS_ROW without rebuilding them."""
+        if self.MAX_LEDS_ROW < 1:
+            self.recreate_regal_frames()
+            return
+        logging.info(f"Reflowing regal frames to {self.MAX_LEDS_ROW} LEDs per row.")
+        self.suspend_led_layout()
+        try:
+            for regal in self.regals.values():
+                regal.reflow(self.MAX_LEDS_ROW)
+        finally:
+            self.resume_led_layout()
 
     def recreate_regal_frames(self):
         """Recreate regal frames using the updated settings."""
         logging.info("Recreating regal frames with updated settings.")
+        self.create_regal_frames(on_done=self.after_regal_frames_recreated)
 
-        # Clear existing regals if any
-        for regal_name, container in self.regal_frames.items():
-            container.destroy()
-        self.regal_frames.clear()
-        self.led_vars.clear()
-        self.led_detail_labels.clear()
-        self.led_edit_buttons.clear()
-        self.led_id_to_regal.clear()
-        self.selected_order.clear()  # Clear selections when changing settings
-
-        # Recreate Regals with updated MAX_LEDS_ROW
-        for regal_name, leds in self.led_data.items():
-            if regal_name.lower() == "selected_order":
-                continue  # Skip the selected_order key
-            Regal(
-                display_name=regal_name,
-                internal_name=regal_name,
-                led_data=leds,
-                controller=self,
-                max_leds_per_row=self.MAX_LEDS_ROW  # Pass the required argument
-            )
-            # Map LED keys to regal names
-            for led_id in leds.keys():
-                led_key = self.generate_unique_led_key(regal_name, led_id)
-                self.led_id_to_regal[led_key] = regal_name
-
+    def after_regal_frames_recreated(self):
+        """Callback once recreate_regal_frames has built every LED."""
         # After recreating regals, re-initialize selections and update UI
         self.initialize_led_selections()
         self.update_all_labels()
@@ -445,44 +694,16 @@ class LEDController:
 
     def define_styles(self):
         """Define custom styles for the application."""
-        # Define styles with a modern color palette and consistent fonts
-        self.style.configure('TFrame', background='#f0f0f0')
-        self.style.configure('TLabel', background='#f0f0f0', font=("Helvetica", 11))
-        self.style.configure('TButton', font=("Helvetica", 11))
-        self.style.configure('TEntry', font=("Helvetica", 11))
-
-        # Define styles for specific buttons
-        button_styles = {
-            'Activate.TButton': {'foreground': 'white', 'background': '#28a745', 'font': ('Helvetica', 12, 'bold')},
-            'Undo.TButton': {'foreground': 'white', 'background': '#6c757d', 'font': ('Helvetica', 12, 'bold')},
-            'Redo.TButton': {'foreground': 'white', 'background': '#17a2b8', 'font': ('Helvetica', 12, 'bold')},
-            'SwitchMode.TButton': {'foreground': 'white', 'background': '#343a40', 'font': ('Helvetica', 12, 'bold')},
-            'Clear.TButton': {'foreground': 'white', 'background': '#fd7e14', 'font': ('Helvetica', 12, 'bold')},
-            'Exit.TButton': {'foreground': 'white', 'background': '#dc3545', 'font': ('Helvetica', 12, 'bold')},
-            'Edit.TButton': {'foreground': 'white', 'background': '#ff0000', 'font': ('Helvetica', 10, 'bold')},
-            'EditSave.TButton': {'foreground': 'white', 'background': '#007bff', 'font': ('Helvetica', 12, 'bold')},
-            'Remove.TButton': {'foreground': 'white', 'background': '#dc3545', 'font': ('Helvetica', 10, 'bold')},
-        }
-
-        for style_name, cfg in button_styles.items():
-            self.style.configure(style_name, **cfg)
-            # Define hover effects
-            hover_bg = self.darken_color(cfg['background'], 0.9)
-            self.style.map(style_name, foreground=[('active', 'white')],
-                           background=[('active', hover_bg)])
-
-    def darken_color(self, color, factor=0.9):
-        """Darken the given color by the given factor."""
-        color = color.lstrip('#')
-        rgb = tuple(int(color[i:i+2], 16)/255.0 for i in (0, 2, 4))
-        h, l, s = colorsys.rgb_to_hls(*rgb)
-        l = max(0, min(1, l * factor))
-        r, g, b = colorsys.hls_to_rgb(h, l, s)
-        return f'#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}'
+        # A modern color palette, consistent fonts and the button hover
+        # effects, sent to Tk as a single script for the active theme
+        self.style.theme_settings(self.style.theme_use(), _THEME_SETTINGS)
 
     def generate_unique_led_key(self, regal_name, led_id):
-        """Generate a unique key for each LED based on its regal and ID."""
-        return f"{regal_name}_{led_id}"
+        """Generate a unique key for each LED based on its regal and ID.
+
+        Bulk code paths read the keys precomputed in flat_leds instead.
+        """
+        return regal_name + "_" + led_id
 
     def setup_gui(self):
         """Setup the main GUI components."""
@@ -518,11 +739,16 @@ class LEDController:
 
         # LED Frame inside Canvas
         self.led_frame = ttk.Frame(self.led_canvas)
-        self.led_canvas.create_window((0, 0), window=self.led_frame, anchor="nw")
+        self.led_frame_window = self.led_canvas.create_window((0, 0), window=self.led_frame, anchor="nw")
+        self.led_layout_suspended = False
 
         # Bind to the frame inside the canvas
         self.led_frame.bind('<Configure>', self.on_frame_configure)
 
+        # Clicks on every LED canvas go through one class binding
+        self.master.bind_class('LedCanvas', '<Button-1>', self.on_led_canvas_click)
+        self.master.bind_class('LedCanvas', '<Button-3>', self.on_led_canvas_click)
+
         # No Project Selected Label
         self.no_project_label = ttk.Label(
             self.led_frame,
@@ -538,10 +764,30 @@ class LEDController:
         # Status Bar
         self.build_status_bar()
 
+        # Start populating projects now that the GUI, progress bar included, is set up
+        self.begin_busy()
+        self.submit_work(self.populate_projects)
+
     def on_frame_configure(self, event):
         """Update scroll region when the inner frame is resized."""
+        if self.led_layout_suspended:
+            return  # resume_led_layout sets it once the build is done
         self.led_canvas.configure(scrollregion=self.led_canvas.bbox("all"))
 
+    def suspend_led_layout(self):
+        """Hide the LED frame while its widgets are rebuilt, so Tk doesn't redraw each step."""
+        if not self.led_layout_suspended:
+            self.led_layout_suspended = True
+            self.led_canvas.itemconfigure(self.led_frame_window, state='hidden')
+
+    def resume_led_layout(self):
+        """Show the rebuilt LED frame and lay it out in a single pass."""
+        if self.led_layout_suspended:
+            self.led_layout_suspended = False
+            self.led_canvas.itemconfigure(self.led_frame_window, state='normal')
+            self.master.update_idletasks()
+            self.on_frame_configure(None)
+
     def build_control_panel(self):
         """Builds the control panel UI."""
         # Project Selection Section
@@ -578,8 +824,9 @@ class LEDController:
         order_frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
 
         # Listbox with drag-and-drop
-        self.order_listbox = tk.Listbox(order_frame, height=10, selectmode=tk.BROWSE)
+        self.order_listbox = tk.Listbox(order_frame, height=10, selectmode=tk.BROWSE, background='white')
         self.order_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,5), pady=5)
+        self.listbox_rows = []  # Row texts currently shown in order_listbox
 
         # Enable drag-and-drop for the Listbox
         self.enable_listbox_drag_and_drop()
@@ -616,13 +863,13 @@ class LEDController:
         undo_button = ttk.Button(undo_redo_frame, text="Undo", command=self.undo_action, style='Undo.TButton')
         undo_button.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
         ToolTip(undo_button, "Undo the last action (Ctrl+Z)")
-        self.master.bind('<Control-z>', lambda event: self.undo_action())
+        self.master.bind('<Control-z>', self.undo_action)
 
         # Redo Button
         redo_button = ttk.Button(undo_redo_frame, text="Redo", command=self.redo_action, style='Redo.TButton')
         redo_button.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         ToolTip(redo_button, "Redo the last undone action (Ctrl+Y)")
-        self.master.bind('<Control-y>', lambda event: self.redo_action())
+        self.master.bind('<Control-y>', self.redo_action)
 
         # Configure grid weights
         undo_redo_frame.columnconfigure(0, weight=1)
@@ -650,13 +897,18 @@ class LEDController:
         exit_button.pack(pady=20, padx=10, fill=tk.X)
         ToolTip(exit_button, "Exit the application")
 
+        # Widgets toggled by control_panel_state (everything but project selection)
+        self.toggleable_widgets = [
+            title_label, mode_label, selection_label,
+            self.order_listbox, remove_button,
+            clear_button, activate_button, undo_button, redo_button, save_button,
+            settings_button, exit_button,
+        ]
+        self.toggleable_state = None  # State last applied to toggleable_widgets
+
         # Initially disable control panel except project selection
         self.control_panel_state('disabled')
 
-        # Start populating projects after GUI is set up
-        # Ensure that the loop is already running before creating tasks
-        asyncio.run_coroutine_threadsafe(self.populate_projects(), self.loop)
-
     def enable_listbox_drag_and_drop(self):
         """Enable drag-and-drop reordering in the Listbox."""
         self.order_listbox.bind('<ButtonPress-1>', self.on_listbox_button_press)
@@ -664,16 +916,20 @@ class LEDController:
         self.order_listbox.bind('<ButtonRelease-1>', self.on_listbox_button_release)
         self.listbox_dragging = False
         self.dragging_item = None
-        self.dragging_label = None
+        # One label follows the cursor during every drag; it is hidden, never destroyed
+        self.dragging_label = tk.Label(self.order_listbox, relief='raised', bg='yellow', font=('Helvetica', 10))
         self.listbox_drag_start_index = None
         self.prev_highlighted_index = None
+        # Latest drag position, handled once per idle cycle by process_listbox_motion
+        self.motion_pending = None
+        self.motion_job = None
 
     def on_listbox_button_press(self, event):
         """Handle the event when a button is pressed in the Listbox."""
         self.listbox_drag_start_index = self.order_listbox.nearest(event.y)
         self.dragging_item = self.order_listbox.get(self.listbox_drag_start_index)
-        # Create a label to drag around
-        self.dragging_label = tk.Label(self.order_listbox, text=self.dragging_item, relief='raised', bg='yellow', font=('Helvetica', 10))
+        # Show the drag label with this item's text
+        self.dragging_label.configure(text=self.dragging_item)
         self.dragging_label.place(x=event.x, y=event.y)
         self.listbox_dragging = True
 
@@ -681,12 +937,22 @@ class LEDController:
         """Handle the event when the mouse is moved with a button pressed in the Listbox."""
         if not self.listbox_dragging:
             return
+        # Only the newest position matters, so bursts of motion events are coalesced
+        self.motion_pending = (event.x, event.y)
+        if self.motion_job is None:
+            self.motion_job = self.master.after_idle(self.process_listbox_motion)
+
+    def process_listbox_motion(self):
+        """Move the drag label and highlight to the latest drag position."""
+        self.motion_job = None
+        if not self.listbox_dragging or self.motion_pending is None:
+            return
+        x, y = self.motion_pending
+        self.motion_pending = None
         # Move the label
-        x = event.x
-        y = event.y
-        self.dragging_label.place(x=x, y=y)
+        self.dragging_label.place_configure(x=x, y=y)
         # Highlight the item under the cursor
-        index = self.order_listbox.nearest(event.y)
+        index = self.order_listbox.nearest(y)
         if self.prev_highlighted_index != index:
             self.highlight_listbox_item(index)
             self.prev_highlighted_index = index
@@ -695,9 +961,12 @@ class LEDController:
         """Handle the event when the mouse button is released in the Listbox."""
         if not self.listbox_dragging:
             return
-        # Remove the label
-        self.dragging_label.destroy()
-        self.dragging_label = None
+        # Drop any motion not yet handled and hide the label until the next drag
+        if self.motion_job is not None:
+            self.master.after_cancel(self.motion_job)
+            self.motion_job = None
+        self.motion_pending = None
+        self.dragging_label.place_forget()
         # Get the drop index
         drop_index = self.order_listbox.nearest(event.y)
         if drop_index < 0:
@@ -706,20 +975,17 @@ class LEDController:
             drop_index = self.order_listbox.size() - 1
         # Rearrange the items
         if drop_index != self.listbox_drag_start_index:
-            # Save state for undo
-            self.undo_stack.append(list(self.selected_order))
-            self.redo_stack.clear()
+            # Record the change in the undo log
+            self.record_undo(('move', self.listbox_drag_start_index, drop_index))
             # Move the item in the selected_order list
             led_key = self.selected_order.pop(self.listbox_drag_start_index)
             self.selected_order.insert(drop_index, led_key)
-            # Update counts
-            self.reset_led_vars()
-            for key in self.selected_order:
-                self.led_vars[key].set(self.led_vars[key].get() + 1)
-            # Update GUI
-            self.update_all_labels()
-            self.update_selection_count()
-            self.update_selected_order_listbox()
+            self.rebuild_order_index()
+            # Counts are unchanged; only LEDs and rows between the two positions renumber
+            first = min(self.listbox_drag_start_index, drop_index)
+            last = max(self.listbox_drag_start_index, drop_index)
+            self.refresh_order_from(first, led_key, last + 1)
+            self.update_selected_order_rows(first, last)
         # Clear highlighting
         if self.prev_highlighted_index is not None:
             self.order_listbox.itemconfig(self.prev_highlighted_index, bg='white')
@@ -737,21 +1003,29 @@ class LEDController:
 
     def clear_listbox_highlight(self):
         """Clear highlighting from all items in the Listbox."""
-        for i in range(self.order_listbox.size()):
-            self.order_listbox.itemconfig(i, bg='white')
+        # Only one item is ever highlighted, so only that one needs resetting
+        if self.prev_highlighted_index is not None:
+            self.order_listbox.itemconfig(self.prev_highlighted_index, bg='white')
+            self.prev_highlighted_index = None
 
     async def populate_projects(self):
         """Asynchronously populate the project combobox with available projects."""
         try:
             projects = await get_available_projects()
-            self.project_combobox['values'] = projects
-            if projects:
-                self.project_combobox.current(0)
-                # Automatically select the first project
-                self.on_project_selected(None)
+            self.call_in_gui(self.set_available_projects, projects)
         except Exception as e:
             logging.error(f"Error fetching projects: {e}")
-            self.queue.put(("error", f"Failed to fetch projects:\n{e}"))
+            self.call_in_gui(messagebox.showerror, "Error", f"Failed to fetch projects:\n{e}")
+        finally:
+            self.call_in_gui(self.end_busy)
+
+    def set_available_projects(self, projects):
+        """Fill the project combobox and load the first project."""
+        self.project_combobox['values'] = projects
+        if projects:
+            self.project_combobox.current(0)
+            # Automatically select the first project
+            self.on_project_selected(None)
 
     def build_status_bar(self):
         """Builds the status bar at the bottom of the main window."""
@@ -763,9 +1037,24 @@ class LEDController:
         status_label = ttk.Label(status_frame, textvariable=self.status_var, relief=tk.SUNKEN, anchor="w")
         status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        # Progress Bar
+        # Progress Bar, only animated while work is in progress
         self.progress_bar = ttk.Progressbar(status_frame, mode='indeterminate')
         self.progress_bar.pack(side=tk.RIGHT, padx=10, pady=2)
+        self.busy_count = 0
+
+    def begin_busy(self):
+        """Start animating the progress bar for a piece of background work."""
+        self.busy_count += 1
+        if self.busy_count == 1:
+            self.progress_bar.start(80)
+
+    def end_busy(self):
+        """Stop the progress bar once all background work has finished."""
+        if self.busy_count == 0:
+            return
+        self.busy_count -= 1
+        if self.busy_count == 0:
+            self.progress_bar.stop()
 
     def toggle_control_panel(self):
         """Toggle visibility of the control panel."""
@@ -783,24 +1072,18 @@ class LEDController:
 
     def control_panel_state(self, state):
         """Enable or disable control panel widgets except Project Selection."""
-        for child in self.control_panel.winfo_children():
-            if isinstance(child, ttk.LabelFrame) and child.cget("text") == "Select Project":
-                continue  # Do not disable project selection
-            try:
-                child.configure(state=state)
-            except:
-                pass
-            for subchild in child.winfo_children():
-                try:
-                    subchild.configure(state=state)
-                except:
-                    pass
+        if state == self.toggleable_state:
+            return  # Every widget already has this state
+        self.toggleable_state = state
+        for widget in self.toggleable_widgets:
+            widget.configure(state=state)
 
     def on_project_selected(self, event):
         """Handle project selection event."""
         if self.is_loading_project:
             return  # Prevent multiple loads at the same time
         self.is_loading_project = True
+        self.begin_busy()
 
         project = self.project_var.get()
         self.selected_project = project
@@ -813,72 +1096,113 @@ class LEDController:
         self.no_project_label.pack_forget()
 
         # Start coroutine to load project data
-        asyncio.run_coroutine_threadsafe(self.load_project_data_async(), self.loop)
+        self.submit_work(self.load_project_data_async)
 
     async def load_project_data_async(self):
         """Asynchronous function to load project data."""
         try:
             logging.info("Starting to load project data.")
-            self.led_data = await load_project_mapping_async(self.selected_project, self.BASE_DIR)
+            self.led_data = await self.load_project_cached(self.selected_project)
+            # Prepare the per-LED data off the GUI thread; only widgets are built there
+            await asyncio.to_thread(self.build_flat_leds)
             logging.info("Project data loaded successfully.")
             # Schedule GUI updates in the main thread
-            self.queue.put(("update_gui", None))
+            self.call_in_gui(self.after_project_load)
         except Exception as e:
             logging.error(f"Error loading project data: {e}")
-            self.queue.put(("error", f"Failed to load project data:\n{e}"))
+            self.call_in_gui(self.end_busy)
+            self.call_in_gui(messagebox.showerror, "Error", f"Failed to load project data:\n{e}")
         finally:
             self.is_loading_project = False  # Reset the loading flag
 
+    async def load_project_cached(self, project):
+        """Load a project's data, reusing the last parse while its file is unchanged."""
+        project_file = os.path.join(self.BASE_DIR, "projects", f"{project}.json")
+        try:
+            st = await asyncio.to_thread(os.stat, project_file)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        cached = self.project_cache.get(project)
+        if stamp is None or cached is None or cached[0] != stamp:
+            data = await load_project_mapping_async(project, self.BASE_DIR)
+            try:
+                st = await asyncio.to_thread(os.stat, project_file)
+                self.project_cache[project] = ((st.st_mtime_ns, st.st_size), data)
+            except OSError:
+                self.project_cache.pop(project, None)
+        else:
+            logging.info(f"Project {project} unchanged on disk, reusing its parsed data.")
+            data = cached[1]
+        # led_data is edited in place during a session, so hand out a copy of
+        # the regal and LED dicts and keep the cached parse pristine
+        return copy_project_data(data)
+
     def after_project_load(self):
         """Callback after project data is loaded."""
         self.determine_mode()  # Determine mode based on project data
         self.mode_var.set(f"Current Mode: {self.current_mode.replace('_', ' ').title()}")  # Update mode label
-        self.create_regal_frames()
+        self.create_regal_frames(on_done=self.after_regal_frames_created)
+
+    def after_regal_frames_created(self):
+        """Callback once the loaded project's LEDs have all been built."""
+        self.end_busy()
         self.show_current_mode()
         self.activate_leds()
 
     def log_regal_keys(self):
         """Log each regal key with its length to detect hidden spaces."""
         for key in self.led_data.keys():
-            logging.info(f"Regal Key: '{key}' (Length: {len(key)})")
+            logging.debug("Regal Key: '%s' (Length: %d)", key, len(key))
 
     def determine_mode(self):
         """Determine the current mode based on the loaded project data."""
-        # Log the raw regal keys
-        logging.debug(f"Raw regal keys: {list(self.led_data.keys())}")
-        self.log_regal_keys()
+        # Log the raw regal keys, only when someone is reading debug output
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Raw regal keys: %s", list(self.led_data.keys()))
+            self.log_regal_keys()
 
         # Extract regal names by checking the keys
-        regal_names = set()
-        for key in self.led_data.keys():
-            regal_names.add(key.strip().lower())
-        logging.debug(f"Extracted regal names: {list(regal_names)}")
+        regal_names = {key.strip().lower() for key in self.led_data}
+        logging.debug("Extracted regal names: %s", regal_names)
 
         # Determine mode with priority to 'benti_regal'
-        if "benti regal" in regal_names:
-            self.current_mode = 'benti_regal'
-            logging.debug("Mode set to 'benti_regal' because 'Benti Regal' is present.")
-        elif "regal1" in regal_names or "regal2" in regal_names:
-            self.current_mode = 'two_regals'
-            logging.debug("Mode set to 'two_regals' because 'Regal1' or 'Regal2' is present.")
-        else:
-            # Default mode or handle unexpected cases
-            self.current_mode = 'two_regals'
-            logging.debug("Mode set to default 'two_regals'.")
-        logging.info(f"Determined mode: {self.current_mode}")
-
-    def create_regal_frames(self):
-        """Create frames for each regal and populate LEDs based on loaded data."""
+        self.current_mode = next(
+            (mode for name, mode in self.MODE_RULES if name in regal_names), 'two_regals'
+        )
+        logging.info("Determined mode: %s", self.current_mode)
+
+    def create_regal_frames(self, on_done=None):
+        """
+        Create frames for each regal and populate LEDs based on loaded data.
+        LED widgets are built LED_BUILD_CHUNK at a time from idle callbacks so
+        the window stays responsive; on_done is called once all exist.
+        """
         logging.info("Creating regal frames.")
+        # Stop a build still in progress for the previous data
+        if self.led_build_job is not None:
+            self.master.after_cancel(self.led_build_job)
+            self.led_build_job = None
+            # A superseded project load never reaches after_regal_frames_created,
+            # so release its hold on the progress bar here
+            if self.led_build_on_done == self.after_regal_frames_created:
+                self.end_busy()
+        self.led_build_on_done = on_done
+
         # Clear existing regals if any
         for regal_name, container in self.regal_frames.items():
             container.destroy()
         self.regal_frames.clear()
-        self.led_vars.clear()
-        self.led_detail_labels.clear()
-        self.led_edit_buttons.clear()
-        self.led_id_to_regal.clear()
+        self.shown_regals = None  # New containers are packed by Regal itself
+        self.regals.clear()
+        self.led_key_components.clear()
+        self.led_path_cache.clear()
+        self.led_file_text.clear()
+        self.leds.clear()
+        self.canvas_led_keys.clear()
         self.selected_order.clear()  # Clear selections when changing projects
+        self.order_index.clear()
+        self.clear_undo_history()  # Recorded operations refer to the old selection
 
         # Create Regals with current MAX_LEDS_ROW
         for regal_name, leds in self.led_data.items():
@@ -889,39 +1213,88 @@ class LEDController:
                 internal_name=regal_name,  # Ensure internal_name == display_name
                 led_data=leds,
                 controller=self,
-                max_leds_per_row=self.MAX_LEDS_ROW  # Pass the required argument
+                max_leds_per_row=self.MAX_LEDS_ROW,  # Pass the required argument
+                populate=False
             )
-            # Map LED keys to regal names
-            for led_id in leds.keys():
-                led_key = self.generate_unique_led_key(regal_name, led_id)
-                self.led_id_to_regal[led_key] = regal_name
+
+        # Map LED keys to regal names and FILE paths
+        self.index_flat_leds()
+
+        # Keep the controls disabled and the frame hidden until every LED widget exists
+        self.control_panel_state('disabled')
+        self.suspend_led_layout()
+        pending = [(self.regals[regal_name], led_id, led_key, led_info)
+                   for regal_name, led_id, led_key, led_info in self.flat_leds]
+        self.build_regals_chunk(pending, 0, on_done)
+
+    def build_regals_chunk(self, pending, start, on_done):
+        """Build the next LED_BUILD_CHUNK LEDs, then yield back to Tk until done."""
+        end = start + self.LED_BUILD_CHUNK
+        for regal, led_id, led_key, led_info in pending[start:end]:
+            regal.add_led(led_id, led_info, led_key)
+        if end < len(pending):
+            self.led_build_job = self.master.after_idle(self.build_regals_chunk, pending, end, on_done)
+            return
+        self.led_build_job = None
+        self.led_build_on_done = None
+        self.control_panel_state('normal')
 
         logging.info("Regal frames created successfully.")
 
-        # Debugging: Log all led_keys in led_vars
-        logging.debug("Current led_vars keys:")
-        for key in self.led_vars.keys():
-            logging.debug(f" - {key}")
+        # Debugging: Log all led_keys
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Current LED keys:")
+            for key in self.leds:
+                logging.debug(" - %s", key)
+
+        try:
+            if on_done is not None:
+                on_done()
+        finally:
+            # on_done may still pack or hide regals, so show the frame only now
+            self.resume_led_layout()
+
+    def build_flat_leds(self):
+        """Flatten led_data into (regal_name, led_id, led_key, led_info) tuples."""
+        self.flat_leds = [
+            (regal_name, led_id, self.generate_unique_led_key(regal_name, led_id), led_info)
+            for regal_name, leds in self.led_data.items()
+            if regal_name.lower() != "selected_order"
+            for led_id, led_info in leds.items()
+        ]
+        # Shelf number of every regal, looked up per LED during activation
+        self.shelf_numbers = {
+            regal_name: self.get_shelf_number(regal_name)
+            for regal_name in self.led_data
+            if regal_name.lower() != "selected_order"
+        }
+        # Ready-made led_sequence entries, so activation only has to look them up
+        self.led_payloads = {
+            led_key: {"shelf_id": self.shelf_numbers[regal_name], "led_id": led_id}
+            for regal_name, led_id, led_key, _ in self.flat_leds
+        }
+
+    def index_flat_leds(self):
+        """Fill the per-LED lookup tables from flat_leds."""
+        for regal_name, led_id, led_key, led_info in self.flat_leds:
+            self.led_key_components[led_key] = (regal_name, led_id)
+            file_path = led_info.get('FILE', '')
+            self.led_path_cache[led_key] = file_path
+            self.led_file_text[led_key] = f"FILE: {file_path}"
 
     def show_current_mode(self):
         """Display LEDs based on the current mode."""
         logging.info(f"Displaying LEDs for mode: {self.current_mode}")
-        for regal_name, container in self.regal_frames.items():
-            # Hide the regal by default
-            container.pack_forget()
-
-        if self.current_mode == 'two_regals':
-            # Show Regal1 and Regal2
-            for regal_name in ["Regal1", "Regal2"]:
-                if regal_name in self.regal_frames:
-                    container = self.regal_frames[regal_name]
-                    container.pack(padx=20, pady=(0, 20), fill=tk.BOTH, expand=True)
-        elif self.current_mode == 'benti_regal':
-            # Show Benti Regal
-            regal_name = "Benti Regal"
-            if regal_name in self.regal_frames:
-                container = self.regal_frames[regal_name]
-                container.pack(padx=20, pady=(0, 20), fill=tk.BOTH, expand=True)
+        wanted = tuple(regal_name for regal_name in self.MODE_REGALS.get(self.current_mode, ())
+                       if regal_name in self.regal_frames)
+        # Re-entering the mode already on screen needs no geometry pass at all
+        if wanted != self.shown_regals:
+            for regal_name, container in self.regal_frames.items():
+                # Hide the regal by default
+                container.pack_forget()
+            for regal_name in wanted:
+                self.regal_frames[regal_name].pack(padx=20, pady=(0, 20), fill=tk.BOTH, expand=True)
+            self.shown_regals = wanted
 
         # After creating regals, update LED selections based on loaded data
         self.initialize_led_selections()
@@ -934,53 +1307,87 @@ class LEDController:
     def initialize_led_selections(self):
         """Initialize LED selections based on loaded project data."""
         logging.info("Initializing LED selections from project data.")
-        self.selected_order.clear()
-        selected_order = self.led_data.get("selected_order", [])
-        for led_key in selected_order:
-            if led_key in self.led_vars:
-                self.selected_order.append(led_key)
-                self.led_vars[led_key].set(self.led_vars[led_key].get() + 1)
+        # Build the order and its index in one pass, then set each LED's count once
+        selected_order = []
+        order_index = {}
+        leds = self.leds
+        for led_key in self.led_data.get("selected_order", []):
+            if led_key in leds:
+                order_index.setdefault(led_key, []).append(len(selected_order))
+                selected_order.append(led_key)
             else:
-                logging.warning(f"LED key '{led_key}' in selected_order not found in led_vars.")
+                logging.warning(f"LED key '{led_key}' in selected_order not found in the layout.")
+        self.selected_order = selected_order
+        self.order_index = order_index
+        for led_key, positions in order_index.items():
+            leds[led_key].var.set(len(positions))
 
     def update_all_labels(self):
         """Update all LED detail labels to reflect current data."""
-        for led_key in self.led_vars:
-            self.update_led_detail(led_key)
+        # Work out every LED's state first, then push only the changes to Tk.
+        # Records and methods are bound once so the loops only do the work.
+        get_state = self.get_led_detail_state
+        apply_state = self.apply_led_state
+        new_states = [(led_key, led, *get_state(led_key)) for led_key, led in self.leds.items()]
+        for led_key, led, detail_text, selected in new_states:
+            apply_state(led_key, led, detail_text, selected)
 
     def update_led_detail(self, led_key):
         """Update the detail label and edit button for a single LED."""
-        selection_count = self.led_vars[led_key].get()
-        if selection_count > 0:
-            occurrences = self.get_led_occurrences_in_order(led_key)
+        if self.suspend_label_updates:
+            self.pending_labels.add(led_key)  # Applied once by flush_pending_labels
+            return
+        led = self.leds[led_key]
+        # Skip building the detail text when nothing it depends on has changed
+        source = (tuple(self.order_index.get(led_key, ())), self.led_file_text.get(led_key))
+        if source == led.source:
+            return
+        self.apply_led_state(led_key, led, *self.get_led_detail_state(led_key))
+        led.source = source
+
+    def flush_pending_labels(self):
+        """Resume label updates, apply the deferred ones once each and redraw."""
+        self.suspend_label_updates = False
+        pending, self.pending_labels = self.pending_labels, set()
+        for led_key in pending:
+            if led_key in self.leds:
+                self.update_led_detail(led_key)
+        self.master.update_idletasks()
+
+    def get_led_detail_state(self, led_key):
+        """Return the (detail text, selected) pair an LED should display."""
+        occurrences = self.order_index.get(led_key)
+        if occurrences:
             order_nums = ', '.join(str(i + 1) for i in occurrences)
-            file_path = self.get_led_file_path(led_key)
-            detail_text = f"Order: {order_nums}\nFILE: {file_path}"
-            self.led_detail_labels[led_key].config(text=detail_text)
-            # Enable the Edit button
-            self.led_edit_buttons[led_key].configure(state='normal')
-            # Update LED color to indicate selection
-            led_canvas, led_circle = self.led_buttons.get(led_key, (None, None))
-            if led_canvas and led_circle:
-                try:
-                    led_canvas.itemconfig(led_circle, fill='green')
-                except tk.TclError as e:
-                    logging.error(f"Error updating LED color for {led_key}: {e}")
-        else:
-            self.led_detail_labels[led_key].config(text=f"FILE: {self.get_led_file_path(led_key)}")
-            # Disable the Edit button
-            self.led_edit_buttons[led_key].configure(state='disabled')
-            # Update LED color to indicate deselection
-            led_canvas, led_circle = self.led_buttons.get(led_key, (None, None))
-            if led_canvas and led_circle:
-                try:
-                    led_canvas.itemconfig(led_circle, fill='grey')
-                except tk.TclError as e:
-                    logging.error(f"Error updating LED color for {led_key}: {e}")
+            return f"Order: {order_nums}\n{self.get_led_file_text(led_key)}", True
+        return self.get_led_file_text(led_key), False
+
+    def apply_led_state(self, led_key, led, detail_text, selected):
+        """Apply a detail state to an LED's widgets, skipping unchanged ones."""
+        led.source = None  # Set again by update_led_detail when it knows the inputs
+        previous = led.applied
+        state = (detail_text, selected)
+        if previous == state:
+            return
+        led.applied = state
+        if previous is None or previous[0] != detail_text:
+            led.detail_label.config(text=detail_text)
+        if previous is not None and previous[1] == selected:
+            return  # Only the order numbers changed; button and color stay as they are
+        # Enable the Edit button only for selected LEDs
+        led.edit_button.configure(state='normal' if selected else 'disabled')
+        # Update LED color to indicate selection
+        try:
+            led.canvas.itemconfig(led.circle, fill='green' if selected else 'grey')
+        except tk.TclError as e:
+            logging.error(f"Error updating LED color for {led_key}: {e}")
 
-    def get_led_occurrences_in_order(self, led_key):
-        """Get a list of indices where the LED appears in the selected_order."""
-        return [i for i, key in enumerate(self.selected_order) if key == led_key]
+    def rebuild_order_index(self):
+        """Rebuild the mapping from LED key to its positions in selected_order."""
+        order_index = {}
+        for i, key in enumerate(self.selected_order):
+            order_index.setdefault(key, []).append(i)
+        self.order_index = order_index
 
     def update_mode_ui(self):
         """Update the UI based on the new mode."""
@@ -992,33 +1399,34 @@ class LEDController:
     def clear_selections(self):
         """Clear all selected LEDs and reset related variables."""
         logging.info("Clearing all selections.")
+        previously_selected = list(self.order_index)
         self.selected_order.clear()
-        self.undo_stack.clear()
-        self.redo_stack.clear()
-        for led_key in self.led_vars:
-            self.led_vars[led_key].set(0)
-            # Update the detail label
-            self.led_detail_labels[led_key].config(text=f"FILE: {self.get_led_file_path(led_key)}")
-            # Disable Edit button
-            self.led_edit_buttons[led_key].configure(state='disabled')
+        self.order_index.clear()
+        self.clear_undo_history()
+        self.suspend_label_updates = True
+        try:
+            # Only LEDs that were selected have widgets to reset
+            for led_key in previously_selected:
+                self.leds[led_key].var.set(0)
+                self.update_led_detail(led_key)
             # Update led_data
-            regal_name = self.led_id_to_regal.get(led_key, "")
-            led_id = led_key.split('_', 1)[1]
-            if regal_name and led_id in self.led_data.get(regal_name, {}):
-                self.led_data[regal_name][led_id]['selected_order'] = []
-            # Update LED color to deselected
-            led_canvas, led_circle = self.led_buttons.get(led_key, (None, None))
-            if led_canvas and led_circle:
-                try:
-                    led_canvas.itemconfig(led_circle, fill='grey')
-                except tk.TclError as e:
-                    logging.error(f"Error updating LED color for {led_key}: {e}")
+            for regal_name, led_id, led_key, led_info in self.flat_leds:
+                led_info['selected_order'] = []
+        finally:
+            self.flush_pending_labels()
         self.selection_var.set(f"Selected LEDs: 0 / {self.MAX_SELECTION}")
         self.order_listbox.delete(0, tk.END)  # Clear the listbox
+        self.listbox_rows = []
         # Hide the edit panel if visible
         self.current_edit_led = None
         logging.info("All selections cleared.")
 
+    def on_led_canvas_click(self, event):
+        """Dispatch a click on any LED canvas to on_led_toggle_canvas."""
+        led_key = self.canvas_led_keys.get(str(event.widget))
+        if led_key is not None:
+            self.on_led_toggle_canvas(led_key, event)
+
     def on_led_toggle_canvas(self, led_key, event):
         """Handle click event on the LED canvas."""
         try:
@@ -1027,7 +1435,7 @@ class LEDController:
             elif event.num == 3:  # Right-click
                 self.decrement_led_selection(led_key)
         except KeyError:
-            logging.error(f"LED key '{led_key}' not found in led_vars.")
+            logging.error(f"LED key '{led_key}' not found.")
             messagebox.showerror("LED Error", f"LED key '{led_key}' does not exist.")
 
     def increment_led_selection(self, led_key):
@@ -1037,37 +1445,50 @@ class LEDController:
             logging.warning("Selection limit reached.")
             return
 
-        # Save the current state to the undo stack before making changes
-        self.undo_stack.append(list(self.selected_order))
-        self.redo_stack.clear()
+        # Record the change in the undo log
+        self.record_undo(('add', led_key))
 
-        self.led_vars[led_key].set(self.led_vars[led_key].get() + 1)
+        led_var = self.leds[led_key].var
+        led_var.set(led_var.get() + 1)
+        self.order_index.setdefault(led_key, []).append(len(self.selected_order))
         self.selected_order.append(led_key)
-        self.update_led_detail(led_key)
-        self.update_selection_count()
-        self.update_selected_order_listbox()
-        logging.info(f"LED {led_key} selection incremented.")
+        self.schedule_led_refresh((led_key,))
+        logging.debug("LED %s selection incremented.", led_key)
 
     def decrement_led_selection(self, led_key):
         """Decrement the selection count for an LED."""
-        if self.led_vars[led_key].get() > 0:
-            # Save the current state to the undo stack before making changes
-            self.undo_stack.append(list(self.selected_order))
-            self.redo_stack.clear()
-
-            self.led_vars[led_key].set(self.led_vars[led_key].get() - 1)
+        if led_key in self.order_index:
             # Remove the last occurrence of the LED from selected_order
-            try:
-                last_index = len(self.selected_order) - 1 - self.selected_order[::-1].index(led_key)
-                del self.selected_order[last_index]
-            except ValueError:
-                logging.warning(f"LED key '{led_key}' not found in selected_order during decrement.")
-            self.update_led_detail(led_key)
-            self.update_selection_count()
-            self.update_selected_order_listbox()
-            logging.info(f"LED {led_key} selection decremented.")
+            last_index = self.order_index[led_key][-1]
+
+            # Record the change in the undo log
+            self.record_undo(('remove', led_key, last_index))
+
+            led_var = self.leds[led_key].var
+            led_var.set(led_var.get() - 1)
+            del self.selected_order[last_index]
+            self.rebuild_order_index()
+            # LEDs after the removed entry move up one place in the order
+            self.schedule_led_refresh({led_key, *self.selected_order[last_index:]})
+            logging.debug("LED %s selection decremented.", led_key)
         else:
-            logging.info(f"LED {led_key} is not selected.")
+            logging.debug("LED %s is not selected.", led_key)
+
+    def schedule_led_refresh(self, led_keys):
+        """Mark LEDs for refresh at the next idle point, together with the count and order list."""
+        self.dirty_leds.update(led_keys)
+        if self.dirty_flush_job is None:
+            self.dirty_flush_job = self.master.after_idle(self.flush_dirty_leds)
+
+    def flush_dirty_leds(self):
+        """Refresh the LEDs marked by schedule_led_refresh, then the count and order list."""
+        self.dirty_flush_job = None
+        dirty, self.dirty_leds = self.dirty_leds, set()
+        for led_key in dirty:
+            if led_key in self.leds:
+                self.update_led_detail(led_key)
+        self.update_selection_count()
+        self.update_selected_order_listbox()
 
     def open_edit_window(self, led_key):
         """Open a pop-up window to edit LED details."""
@@ -1079,224 +1500,287 @@ class LEDController:
             return
 
         self.current_edit_led = led_key
+        title = f"Edit LED {self.led_key_components[led_key][1]}"
+
+        # The window is built once and only hidden when closed
+        if self.edit_window is not None:
+            self.edit_window.title(title)
+            self.edit_file_var.set(self.get_led_file_path(led_key))
+            self.edit_window.deiconify()
+            self.edit_window.grab_set()
+            return
 
         # Create a new Toplevel window
         edit_window = tk.Toplevel(self.master)
-        edit_window.title(f"Edit LED {led_key.split('_', 1)[1]}")
+        edit_window.title(title)
         edit_window.geometry("400x150")
         edit_window.grab_set()  # Make the window modal
-
-        # Define a handler for the window close event
-        def on_close():
-            """Handle the edit window being closed without saving."""
-            logging.info(f"Edit window for LED {led_key} closed without saving.")
-            self.current_edit_led = None
-            edit_window.destroy()
-
-        # Bind the handler to the WM_DELETE_WINDOW protocol
-        edit_window.protocol("WM_DELETE_WINDOW", on_close)
+        edit_window.protocol("WM_DELETE_WINDOW", self.cancel_edit_window)
+        self.edit_window = edit_window
 
         # FILE Path
         file_frame = ttk.Frame(edit_window)
         file_frame.pack(pady=10, padx=10, fill=tk.X)
         file_label = ttk.Label(file_frame, text="FILE Path:", font=("Helvetica", 10))
         file_label.pack(side=tk.LEFT, padx=(0, 5))
-        file_var = tk.StringVar(value=self.get_led_file_path(led_key))
-        file_entry = ttk.Entry(file_frame, textvariable=file_var, width=30)
+        self.edit_file_var = tk.StringVar(value=self.get_led_file_path(led_key))
+        file_entry = ttk.Entry(file_frame, textvariable=self.edit_file_var, width=30)
         file_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
         # Browse Button to select a new file
-        def browse_file():
-            initial_dir = os.path.join(self.BASE_DIR, "data")
-            new_file = filedialog.askopenfilename(
-                title="Select New Data File",
-                filetypes=(("Image Files", "*.png;*.jpg;*.jpeg"), ("All Files", "*.*")),
-                initialdir=initial_dir
-            )
-            if new_file:
-                try:
-                    # Compute the relative path from BASE_DIR
-                    relative_path = os.path.relpath(new_file, self.BASE_DIR)
-                    # Normalize path to use forward slashes
-                    relative_path = relative_path.replace("\\", "/")
-                    file_entry.delete(0, tk.END)
-                    file_entry.insert(0, relative_path)
-                    logging.info(f"Selected new file for LED {led_key}: {relative_path}")
-                except ValueError:
-                    # If relpath fails (e.g., different drives on Windows), alert the user
-                    messagebox.showerror("Path Error", "Selected file is outside the base directory. Please choose a file within the application directory.")
-                    logging.error("Selected file is outside the base directory.")
-
-        browse_button = ttk.Button(file_frame, text="Browse", command=browse_file)
+        browse_button = ttk.Button(file_frame, text="Browse", command=self.browse_edit_file)
         browse_button.pack(side=tk.LEFT, padx=5)
 
-        # Save Button
+        # Save Button, always saving for the LED currently being edited
         save_button = ttk.Button(edit_window, text="Save Changes",
-                                 command=lambda: asyncio.run_coroutine_threadsafe(
-                                     self.save_led_changes_async(led_key, file_var.get(), edit_window),
-                                     self.loop
-                                 ),
+                                 command=self.submit_edit_window,
                                  style='EditSave.TButton')
         save_button.pack(pady=10, padx=10, fill=tk.X)
         ToolTip(save_button, "Save the changes made to the LED's FILE path")
 
+    def cancel_edit_window(self):
+        """Handle the edit window being closed without saving."""
+        logging.info(f"Edit window for LED {self.current_edit_led} closed without saving.")
+        self.close_edit_window(self.edit_window)
+
+    def browse_edit_file(self):
+        """Let the user pick a new FILE for the LED being edited."""
+        initial_dir = os.path.join(self.BASE_DIR, "data")
+        new_file = filedialog.askopenfilename(
+            title="Select New Data File",
+            filetypes=(("Image Files", "*.png;*.jpg;*.jpeg"), ("All Files", "*.*")),
+            initialdir=initial_dir
+        )
+        if new_file:
+            try:
+                # Compute the path relative to BASE_DIR, with forward slashes on every platform
+                relative_path = str(PurePosixPath(Path(new_file).resolve().relative_to(self.BASE_PATH)))
+                self.edit_file_var.set(relative_path)
+                logging.info(f"Selected new file for LED {self.current_edit_led}: {relative_path}")
+            except ValueError:
+                # Outside BASE_DIR (e.g., a different drive on Windows), alert the user
+                messagebox.showerror("Path Error", "Selected file is outside the base directory. Please choose a file within the application directory.")
+                logging.error("Selected file is outside the base directory.")
+
+    def submit_edit_window(self):
+        """Queue saving the edit window's FILE path for the LED being edited."""
+        if self.current_edit_led is None:
+            return
+        self.submit_work(self.save_led_changes_async, self.current_edit_led,
+                         self.edit_file_var.get(), self.edit_window)
+
     def get_led_file_path(self, led_key):
         """Retrieve the FILE path for a given LED."""
-        regal_name = self.led_id_to_regal.get(led_key, "")
-        led_id = led_key.split('_', 1)[1]
-        return self.led_data.get(regal_name, {}).get(led_id, {}).get('FILE', '')
+        # Filled for every LED by index_flat_leds and updated by save_led_changes_async
+        return self.led_path_cache.get(led_key, '')
+
+    def get_led_file_text(self, led_key):
+        """Retrieve the "FILE: ..." label text for a given LED."""
+        return self.led_file_text.get(led_key, "FILE: ")
 
     async def save_led_changes_async(self, led_key, new_file, window):
         """Asynchronous function to save the changes made to the LED's FILE."""
         logging.info(f"Saving changes for LED {led_key}: FILE={new_file}")
         if not new_file.strip():
-            self.queue.put(("warning", "'FILE' path cannot be empty."))
+            self.call_in_gui(messagebox.showwarning, "Warning", "'FILE' path cannot be empty.")
             logging.warning(f"Attempted to save empty FILE path for LED {led_key}.")
             return
 
         # Resolve the absolute path
-        absolute_new_file = os.path.join(self.BASE_DIR, new_file.strip())
+        absolute_new_file = self.BASE_PATH / new_file.strip()
 
-        if not os.path.isfile(absolute_new_file):
-            self.queue.put(("warning", f"The specified file does not exist:\n{new_file.strip()}"))
+        # Checked in a worker thread so slow or network storage doesn't stall the loop
+        if not await asyncio.to_thread(os.path.isfile, absolute_new_file):
+            self.call_in_gui(messagebox.showwarning, "Warning", f"The specified file does not exist:\n{new_file.strip()}")
             logging.warning(f"FILE path does not exist for LED {led_key}: {new_file.strip()}")
             return
 
         # Update the data structure
-        regal_name = self.led_id_to_regal.get(led_key, "")
-        led_id = led_key.split('_', 1)[1]
+        regal_name, led_id = self.led_key_components.get(led_key, ("", ""))
         if regal_name and led_id in self.led_data.get(regal_name, {}):
             self.led_data[regal_name][led_id]['FILE'] = new_file.strip()
+            self.led_path_cache[led_key] = new_file.strip()
+            self.led_file_text[led_key] = f"FILE: {new_file.strip()}"
             # Update the label in the main thread
-            self.queue.put(("update_led_detail", (led_key, None)))
-            self.queue.put(("info", "LED FILE path updated successfully."))
+            self.call_in_gui(self.update_led_detail, led_key)
+            self.call_in_gui(messagebox.showinfo, "Info", "LED FILE path updated successfully.")
             logging.info(f"LED {led_key} FILE path updated to: {new_file.strip()}")
 
             # Close the edit window in the main thread
-            self.queue.put(("close_edit_window", window))
+            self.call_in_gui(self.close_edit_window, window)
         else:
-            self.queue.put(("error", "Invalid LED key."))
+            self.call_in_gui(messagebox.showerror, "Error", "Invalid LED key.")
             logging.error(f"Invalid LED key during save: {led_key}")
 
-    def undo_action(self):
-        """Undo the last action."""
+    def undo_action(self, event=None):
+        """Undo the last action (also bound to Ctrl+Z)."""
+        self.flush_undo_batch()
         if not self.undo_stack:
             messagebox.showinfo("Undo", "No actions to undo.")
             logging.info("Undo attempted with empty stack.")
             return
-        # Save the current state to redo stack
-        self.redo_stack.append(list(self.selected_order))
-        # Restore the last state from undo stack
-        last_state = self.undo_stack.pop()
-        self.restore_selection(last_state)
+        # Revert the last change and make it available to redo
+        op = self.undo_stack.pop()
+        self.apply_undo_op(op, inverse=True)
+        self.redo_stack.append(op)
         logging.info("Undo action performed.")
 
-    def redo_action(self):
-        """Redo the last undone action."""
+    def redo_action(self, event=None):
+        """Redo the last undone action (also bound to Ctrl+Y)."""
+        self.flush_undo_batch()
         if not self.redo_stack:
             messagebox.showinfo("Redo", "No actions to redo.")
             logging.info("Redo attempted with empty stack.")
             return
-        # Save the current state to undo stack
-        self.undo_stack.append(list(self.selected_order))
-        # Restore the last undone state from redo stack
-        next_state = self.redo_stack.pop()
-        self.restore_selection(next_state)
+        # Reapply the last undone change and make it available to undo
+        op = self.redo_stack.pop()
+        self.apply_undo_op(op)
+        self.undo_stack.append(op)
         logging.info("Redo action performed.")
 
-    def restore_selection(self, state):
-        """Restore LED selections based on the provided state."""
-        logging.info("Restoring LED selections from state.")
-        # Reset selection counts
-        for led_key in self.led_vars.keys():
-            self.led_vars[led_key].set(0)
-        # Clear current selections
-        self.selected_order = state.copy()
-        # Recalculate selection counts
-        for led_key in self.selected_order:
-            self.led_vars[led_key].set(self.led_vars[led_key].get() + 1)
-        # Update LED details
-        for led_key in self.led_vars.keys():
-            self.update_led_detail(led_key)
+    def record_undo(self, op):
+        """Log an operation for undo; operations within UNDO_BATCH_MS form one entry."""
+        self.redo_stack.clear()
+        self.undo_batch.append(op)
+        if self.undo_batch_job is None:
+            self.undo_batch_job = self.master.after(self.UNDO_BATCH_MS, self.flush_undo_batch)
+
+    def flush_undo_batch(self):
+        """Push the pending batch of operations onto the undo stack."""
+        if self.undo_batch_job is not None:
+            self.master.after_cancel(self.undo_batch_job)
+            self.undo_batch_job = None
+        ops, self.undo_batch = self.undo_batch, []
+        if ops:
+            self.undo_stack.append(ops[0] if len(ops) == 1 else ('batch', ops))
+
+    def clear_undo_history(self):
+        """Drop all undo and redo entries, including a batch still being recorded."""
+        if self.undo_batch_job is not None:
+            self.master.after_cancel(self.undo_batch_job)
+            self.undo_batch_job = None
+        self.undo_batch = []
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def apply_undo_op(self, op, inverse=False):
+        """
+        Apply an undo log entry to selected_order, or revert it when inverse is True.
+        Entries are ('add', led_key), ('remove', led_key, index), ('move', src, dst)
+        or ('batch', [entries]).
+        """
+        kind = op[0]
+        if kind == 'batch':
+            self.suspend_label_updates = True
+            try:
+                for sub_op in (reversed(op[1]) if inverse else op[1]):
+                    self.apply_undo_op(sub_op, inverse)
+            finally:
+                self.flush_pending_labels()
+            return
+        if kind == 'move':
+            _, src, dst = op
+            if inverse:
+                src, dst = dst, src
+            led_key = self.selected_order.pop(src)
+            self.selected_order.insert(dst, led_key)
+            start, count_delta = min(src, dst), 0
+        elif kind == 'add':
+            led_key = op[1]
+            if inverse:
+                start, count_delta = len(self.selected_order) - 1, -1
+                del self.selected_order[start]
+            else:
+                start, count_delta = len(self.selected_order), 1
+                self.selected_order.append(led_key)
+        else:  # 'remove'
+            _, led_key, start = op
+            if inverse:
+                self.selected_order.insert(start, led_key)
+                count_delta = 1
+            else:
+                del self.selected_order[start]
+                count_delta = -1
+        if count_delta:
+            led_var = self.leds[led_key].var
+            led_var.set(led_var.get() + count_delta)
+        self.rebuild_order_index()
+        self.refresh_order_from(start, led_key)
         self.update_selection_count()
         self.update_selected_order_listbox()
-        logging.info("LED selections restored successfully.")
+
+    def refresh_order_from(self, start, led_key, end=None):
+        """Refresh the labels of led_key and every LED from position start up to end."""
+        for key in {led_key, *self.selected_order[start:end]}:
+            self.update_led_detail(key)
 
     def update_selection_count(self):
         """Update the selection count label."""
-        self.selection_var.set(f"Selected LEDs: {len(self.selected_order)} / {self.MAX_SELECTION}")
-        logging.debug(f"Selection count updated: {self.selection_var.get()}")
+        selection_text = f"Selected LEDs: {len(self.selected_order)} / {self.MAX_SELECTION}"
+        self.selection_var.set(selection_text)
+        logging.debug("Selection count updated: %s", selection_text)
 
     def save_project_json(self):
         """Save the current LED data back to the project's JSON file."""
         logging.info("Saving project JSON data.")
+        # Snapshot the project and its data here, on the thread that owns them;
+        # the save may wait in the work queue while another project is picked
+        self.led_data["selected_order"] = list(self.selected_order)
+        snapshot = copy_project_data(self.led_data)
 
         # Start coroutine to save project data
-        asyncio.run_coroutine_threadsafe(self.save_project_json_async(), self.loop)
+        self.submit_work(self.save_project_json_async, self.selected_project, snapshot)
 
-    async def save_project_json_async(self):
-        """Asynchronous function to save project data."""
+    async def save_project_json_async(self, project, led_data):
+        """Asynchronous function to save a snapshot of a project's data."""
         try:
-            # Update led_data with the current selections
-            self.led_data["selected_order"] = list(self.selected_order)
-            await save_project_json_async(self.selected_project, self.led_data, self.BASE_DIR)
+            await save_project_json_async(project, led_data, self.BASE_DIR)
+            self.project_cache.pop(project, None)
             logging.info("Project data saved successfully.")
-            self.queue.put(("info", "Project data saved successfully."))
+            self.call_in_gui(messagebox.showinfo, "Info", "Project data saved successfully.")
         except Exception as e:
             logging.error(f"Error saving project data: {e}")
-            self.queue.put(("error", f"Failed to save project data:\n{e}"))
+            self.call_in_gui(messagebox.showerror, "Error", f"Failed to save project data:\n{e}")
 
     def reload_project_data(self):
         """Reload project data after editing."""
         logging.info("Reloading project data after editing.")
 
         # Start coroutine to reload project data
-        asyncio.run_coroutine_threadsafe(self.load_project_data_async(), self.loop)
+        self.begin_busy()
+        self.submit_work(self.load_project_data_async)
 
     def activate_leds(self):
         """Activate selected LEDs."""
         logging.info("Activating selected LEDs.")
 
         # Start coroutine to activate LEDs
-        asyncio.run_coroutine_threadsafe(self.send_led_control_request_async(), self.loop)
+        self.submit_work(self.send_led_control_request_async)
 
     async def send_led_control_request_async(self):
         """Asynchronous function to send LED control request."""
         if not self.selected_project:
-            self.queue.put(("warning", "No project selected. Please select a project first."))
+            self.call_in_gui(messagebox.showwarning, "Warning", "No project selected. Please select a project first.")
             logging.warning("Attempted to activate LEDs without selecting a project.")
             return
 
         if not self.selected_order:
-            self.queue.put(("warning", "No LEDs selected to activate. Please select LEDs first."))
+            self.call_in_gui(messagebox.showwarning, "Warning", "No LEDs selected to activate. Please select LEDs first.")
             logging.warning("Attempted to activate LEDs without any selections.")
             return
 
         # Prepare the payload based on the selected LEDs
+        led_sequence = [self.led_payloads[led_key] for led_key in self.selected_order]
         payload = {
             "data": {
                 "init": {
                     "shelves": {}
                 },
-                "led_sequence": []
+                "led_sequence": led_sequence
             }
         }
 
-        shelf_ids = set()
-        for led_key in self.selected_order:
-            regal_name = self.led_id_to_regal.get(led_key, "Unknown")
-            try:
-                regal_name_clean, led_id = led_key.split('_', 1)
-            except ValueError:
-                logging.error(f"Invalid led_key format during activation: '{led_key}'. Skipping.")
-                continue
-            shelf_num = self.get_shelf_number(regal_name_clean)
-            shelf_ids.add(shelf_num)
-            # Add LED to the sequence
-            payload["data"]["led_sequence"].append({
-                "shelf_id": shelf_num,
-                "led_id": led_id
-            })
+        shelf_ids = {entry["shelf_id"] for entry in led_sequence}
 
         # Determine controlled values - DONT CHANGE THIS CHATGPT
         for shelf_id in shelf_ids:
@@ -1310,74 +1794,120 @@ class LEDController:
 
         # Send the POST request to the server
         try:
-            async with self.session.post("http://127.0.0.1:1080/pick/leds", json=payload) as response:
+            async with self.session.post(self.LEDS_URL, json=payload) as response:
                 if response.status == 200:
                     result = await response.json()
                     logging.info(f"LEDs activated successfully: {result}")
-                    #self.queue.put(("info", "LEDs activated successfully."))
+                    #self.call_in_gui(messagebox.showinfo, "Info", "LEDs activated successfully.")
                 else:
                     error_msg = f"Failed to activate LEDs. Server responded with status code {response.status}."
                     logging.error(error_msg)
-                    self.queue.put(("error", error_msg))
+                    self.call_in_gui(messagebox.showerror, "Error", error_msg)
         except Exception as e:
             error_msg = f"An unexpected error occurred: {e}"
             logging.error(error_msg)
-            self.queue.put(("error", error_msg))
+            self.call_in_gui(messagebox.showerror, "Error", error_msg)
 
     def get_shelf_number(self, regal_name):
         """Determine the shelf number based on the regal name."""
-        if regal_name.lower() == "regal1":
-            return "1"
-        elif regal_name.lower() == "regal2":
-            return "2"
-        elif regal_name.lower() == "benti regal":
-            return "1"
-        else:
-            return "0"  # Unknown shelf
+        return self.SHELF_NUMBERS.get(regal_name.lower(), "0")  # "0" for unknown shelves
+
+    def setup_queue_wakeup(self):
+        """Let Tk watch a pipe that call_in_gui writes to after queueing a callback."""
+        self.wakeup_fds = None
+        if not hasattr(self.master.tk, 'createfilehandler'):
+            return  # Not supported by Tk on Windows; process_queue polls instead
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        self.master.tk.createfilehandler(read_fd, tk.READABLE, self.on_queue_wakeup)
+        self.wakeup_fds = (read_fd, write_fd)
+
+    def on_queue_wakeup(self, fd, mask):
+        """Drain the wake-up pipe and run the queued callbacks."""
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self.drain_queue()
 
-    def process_queue(self):
-        """Process messages from the asyncio thread."""
+    def call_in_gui(self, callback, *args):
+        """Schedule callback(*args) on the GUI thread. Safe to call from the asyncio loop."""
+        self.queue.put((callback, args))
+        if self.wakeup_fds:
+            try:
+                os.write(self.wakeup_fds[1], b'\0')
+            except BlockingIOError:
+                pass  # Pipe is full, so a wake-up is already pending
+
+    def drain_queue(self):
+        """Run all callbacks handed over from the asyncio thread. Returns True if any ran."""
+        batch = []
         try:
             while True:
-                message_type, data = self.queue.get_nowait()
-                if message_type == "update_gui":
-                    self.after_project_load()
-                elif message_type == "update_mode_ui":
-                    self.update_mode_ui()
-                elif message_type == "update_led_detail":
-                    led_key, _ = data
-                    self.update_led_detail(led_key)
-                elif message_type == "close_edit_window":
-                    window = data
-                    window.destroy()
-                    self.current_edit_led = None
-                elif message_type == "block_completed":
-                    self.handle_block_completed_gui()
-                elif message_type == "info":
-                    messagebox.showinfo("Info", data)
-                elif message_type == "warning":
-                    messagebox.showwarning("Warning", data)
-                elif message_type == "error":
-                    messagebox.showerror("Error", data)
+                batch.append(self.queue.get_nowait())
                 self.queue.task_done()
         except Empty:
             pass
+        if not batch:
+            return False
+
+        # Identical calls to the idempotent refreshes in COALESCED_CALLBACKS run
+        # once; everything else runs as often as it was queued. Dialogs block
+        # until dismissed, so they run after every other update in the batch.
+        updates = {}
+        dialogs = []
+        for item in batch:
+            callback = item[0]
+            if callback in self.DIALOG_CALLBACKS:
+                dialogs.append(item)
+                continue
+            if callback in self.COALESCED_CALLBACKS:
+                try:
+                    updates.setdefault(item, item)
+                    continue
+                except TypeError:
+                    pass  # Unhashable arguments are never merged
+            updates[object()] = item
+        for callback, args in (*updates.values(), *dialogs):
+            try:
+                callback(*args)
+            except Exception as e:
+                logging.error(f"Error in GUI callback {callback.__name__}: {e}")
+        return True
 
-        self.master.after(100, self.process_queue)  # Check the queue every 100 ms
+    def process_queue(self):
+        """Periodically run callbacks handed over from the asyncio thread (no wake-up pipe)."""
+        handled = self.drain_queue()
 
-    def handle_block_completed_gui(self):
-        """Handle block completed event in the GUI thread."""
-        logging.info("Handling block completed in GUI thread")
-        # Optionally, show a message or perform an action
-        # messagebox.showinfo("Block Mode", "Block mode has been completed.")
-        self.activate_leds()
+        # Poll quickly while messages are arriving, back off while idle
+        if handled:
+            self.queue_poll_interval = self.QUEUE_POLL_MIN_MS
+        else:
+            self.queue_poll_interval = min(int(self.queue_poll_interval * 1.5), self.QUEUE_POLL_MAX_MS)
+        try:
+            self.master.after(self.queue_poll_interval, self.process_queue)
+        except tk.TclError:
+            pass  # The main window is being destroyed
+
+    def close_edit_window(self, window):
+        """Hide the edit window so the next open can reuse it."""
+        window.grab_release()
+        window.withdraw()
+        self.current_edit_led = None
 
     def on_close(self):
         """Handle application closure."""
         logging.info("Closing application.")
-        # Start coroutine to close aiohttp session
-        asyncio.run_coroutine_threadsafe(self.session.close(), self.loop)
+        # Close the aiohttp session (and its kept-alive connection) before stopping the loop
+        try:
+            asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(timeout=2)
+        except Exception as e:
+            logging.warning(f"Could not close the HTTP session cleanly: {e}")
         self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.wakeup_fds:
+            self.master.tk.deletefilehandler(self.wakeup_fds[0])
         self.master.destroy()
 
     def __del__(self):
@@ -1394,12 +1924,33 @@ class LEDController:
 
     def update_selected_order_listbox(self):
         """Update the listbox to reflect the current selected_order."""
-        self.order_listbox.delete(0, tk.END)
-        for index, led_key in enumerate(self.selected_order, start=1):
-            regal_name, led_id = led_key.split('_', 1)
-            display_text = f"{index}. {regal_name} - LED {led_id}"
-            self.order_listbox.insert(tk.END, display_text)
-            self.order_listbox.itemconfig(tk.END, bg='white')  # Set default background color
+        components = self.led_key_components
+        rows = [f"{index}. {regal_name} - LED {led_id}"
+                for index, (regal_name, led_id) in enumerate(map(components.__getitem__, self.selected_order), start=1)]
+        # Rows are numbered, so everything after the first differing row changes;
+        # keep the common prefix and rewrite only the tail
+        shown = self.listbox_rows
+        common = 0
+        for old, new in zip(shown, rows):
+            if old != new:
+                break
+            common += 1
+        if common < len(shown):
+            self.order_listbox.delete(common, tk.END)
+        if common < len(rows):
+            # One insert for the new rows; they inherit the white listbox background
+            self.order_listbox.insert(tk.END, *rows[common:])
+        self.listbox_rows = rows
+
+    def update_selected_order_rows(self, first, last):
+        """Rewrite only listbox rows first..last (inclusive) after they were reordered."""
+        rows = []
+        for index in range(first, last + 1):
+            regal_name, led_id = self.led_key_components[self.selected_order[index]]
+            rows.append(f"{index + 1}. {regal_name} - LED {led_id}")
+        self.order_listbox.delete(first, last)
+        self.order_listbox.insert(first, *rows)
+        self.listbox_rows[first:last + 1] = rows
 
     def remove_selected_order(self):
         """Remove the selected LED from the order."""
@@ -1409,22 +1960,17 @@ class LEDController:
             return
         index = selected_indices[0]
         led_key = self.selected_order[index]
-        # Save state for undo
-        self.undo_stack.append(list(self.selected_order))
-        self.redo_stack.clear()
+        # Record the change in the undo log
+        self.record_undo(('remove', led_key, index))
         # Remove from selected_order
         del self.selected_order[index]
+        self.rebuild_order_index()
         # Update counts
-        self.led_vars[led_key].set(self.led_vars[led_key].get() - 1)
-        # Update LED detail
-        self.update_led_detail(led_key)
+        led_var = self.leds[led_key].var
+        led_var.set(led_var.get() - 1)
+        # Update the details of this LED and of those that moved up in the order
+        self.refresh_order_from(index, led_key)
         # Update GUI
         self.update_selection_count()
         self.update_selected_order_listbox()
         logging.info(f"Removed LED {led_key} from selection order.")
-
-    def reset_led_vars(self):
-        """Reset all LED selection variables."""
-        for led_key in self.led_vars.keys():
-            self.led_vars[led_key].set(0)
-
@@ -1,5 +1,6 @@
 # main.py
 
+import os
 import threading
 import logging
 from network.run_server import run_server
@@ -32,9 +33,10 @@ def start_gui():
     root.mainloop()
 
 if __name__ == "__main__":
-    # Configure logging
+    # Configure logging: INFO by default, LIDARGUI_LOGLEVEL=DEBUG for detailed logs
+    level_name = os.environ.get('LIDARGUI_LOGLEVEL', 'INFO').upper()
     logging.basicConfig(
-        level=logging.DEBUG,  # Set to DEBUG for detailed logs
+        level=getattr(logging, level_name, logging.INFO),
         format='%(asctime)s [%(levelname)s] %(message)s',
         handlers=[
             logging.FileHandler("appdebug.log"),  # Logs to a file
@@ -53,7 +53,7 @@ async def send_led_control_request_async(selected_project, selected_order, led_i
             messagebox.showerror("Error", f"Shelf number for LED key '{led_key}' is invalid.")
             return
 
-        led_id = led_key.split('_')[1]
+        led_id = led_key.rpartition('_')[2]
         if shelf_number not in shelves_payload:
             shelves_payload[shelf_number] = {'leds': {}}
         shelves_payload[shelf_number]['leds'][str(led_id)] = {
@@ -5,13 +5,22 @@ import logging
 import serial_asyncio
 from uvicorn import Config, Server
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows)
+    uvloop = None
+
+def new_event_loop():
+    """Create a new event loop, backed by uvloop when it is installed."""
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
 def run_server():
     """
     Initializes and runs the asynchronous server in its own event loop.
     This function is intended to be run in a separate thread.
     """
-    # Create a new event loop for this thread
-    loop = asyncio.new_event_loop()
+    # Create a new event loop for this thread, backed by uvloop when available
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
     logging.info(f"Run_server thread event loop set: {loop}")
 